@@ -0,0 +1,144 @@
+"""
+Vectorized Cramer's V for categorical columns.
+
+Every column is factorised once. The contingency tables of all columns against a
+target are built with a single np.bincount over offset codes, and chi-squared and
+Cramer's V are reduced per column with np.add.reduceat, so no per-column crosstab
+or chi2_contingency call is needed. The pairwise categorical x categorical matrix
+uses the same codes and can be spread over a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+
+def factorize_columns(df, columns):
+    """
+    Integer codes (n_rows, n_cols) for the given columns (-1 for missing) and the
+    number of levels of each column
+    """
+    codes = np.empty((len(df), len(columns)), dtype=np.int64)
+    n_levels = np.empty(len(columns), dtype=np.int64)
+    for j, col in enumerate(columns):
+        codes[:, j], uniques = pd.factorize(df[col])
+        n_levels[j] = len(uniques)
+    return codes, n_levels
+
+
+def _chi2_from_tables(observed, segments, yates=True):
+    """
+    Chi-squared statistic of stacked contingency tables.
+
+    ``observed`` is (sum of levels, n_target) with the rows of table j starting at
+    ``segments[j]``. Empty rows and columns are ignored, as pd.crosstab drops them.
+    Returns chi2, n and the shape of each table after dropping empty levels.
+    """
+    sizes = np.diff(np.append(segments, len(observed)))
+    seg_id = np.repeat(np.arange(len(segments)), sizes)
+    row_sums = observed.sum(axis=1)
+    col_sums = np.add.reduceat(observed, segments, axis=0)  # (n_tables, n_target)
+    n = col_sums.sum(axis=1)
+    n_rows = np.add.reduceat((row_sums > 0).astype(np.int64), segments)
+    n_cols = (col_sums > 0).sum(axis=1)
+
+    expected = row_sums[:, None] * col_sums[seg_id] / n[seg_id, None]
+    diff = expected - observed
+    if yates:
+        # Yates' continuity correction for 2x2 tables, as chi2_contingency applies it
+        dof1 = ((n_rows - 1) * (n_cols - 1) == 1)[seg_id]
+        shift = np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        diff = np.where(dof1[:, None], diff - shift, diff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(expected > 0, diff**2 / expected, 0.0)
+    chi2 = np.add.reduceat(terms.sum(axis=1), segments)
+    return chi2, n, n_rows, n_cols
+
+
+def _cramers_v(chi2, n, n_rows, n_cols, bias_correction=False):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if not bias_correction:
+            return np.sqrt(chi2 / (n * (np.minimum(n_rows, n_cols) - 1)))
+        # Bergsma (2013) bias-corrected estimator
+        phi2 = np.maximum(0.0, chi2 / n - (n_rows - 1) * (n_cols - 1) / (n - 1))
+        rows_corr = n_rows - (n_rows - 1) ** 2 / (n - 1)
+        cols_corr = n_cols - (n_cols - 1) ** 2 / (n - 1)
+        return np.sqrt(phi2 / np.minimum(rows_corr - 1, cols_corr - 1))
+
+
+def cramers_v_against(df, columns, target, bias_correction=False, yates=True):
+    """
+    Cramer's V of every column in ``columns`` against ``target``, in one sweep
+    """
+    columns = list(columns)
+    if not columns:
+        return pd.Series(dtype=float)
+    codes, n_levels = factorize_columns(df, columns)
+    target_codes, target_levels = pd.factorize(df[target])
+    n_target = len(target_levels)
+
+    # shift each column's codes into its own block, then count (level, target) pairs
+    segments = np.concatenate([[0], np.cumsum(n_levels)[:-1]])
+    valid = (codes >= 0) & (target_codes >= 0)[:, None]
+    flat = (codes + segments) * n_target + target_codes[:, None]
+    observed = np.bincount(flat[valid], minlength=n_levels.sum() * n_target)
+    observed = observed.reshape(-1, n_target).astype(float)
+
+    chi2, n, n_rows, n_cols = _chi2_from_tables(observed, segments, yates)
+    return pd.Series(
+        _cramers_v(chi2, n, n_rows, n_cols, bias_correction), index=columns
+    )
+
+
+_pair_codes = None
+
+
+def _init_pair_worker(codes, n_levels):
+    global _pair_codes
+    _pair_codes = (codes, n_levels)
+
+
+def _pair_cramers_v(pair, bias_correction, yates):
+    codes, n_levels = _pair_codes
+    i, j = pair
+    a, b = codes[:, i], codes[:, j]
+    valid = (a >= 0) & (b >= 0)
+    observed = np.bincount(
+        a[valid] * n_levels[j] + b[valid], minlength=n_levels[i] * n_levels[j]
+    )
+    observed = observed.reshape(n_levels[i], n_levels[j]).astype(float)
+    chi2, n, n_rows, n_cols = _chi2_from_tables(observed, np.array([0]), yates)
+    return _cramers_v(chi2, n, n_rows, n_cols, bias_correction)[0]
+
+
+def _pair_job(args):
+    return _pair_cramers_v(*args)
+
+
+def cramers_v_matrix(df, columns, bias_correction=False, yates=True, max_workers=1):
+    """
+    Symmetric matrix of Cramer's V between every pair of ``columns``;
+    ``max_workers`` > 1 (or None for all cores) spreads the pairs over processes
+    """
+    columns = list(columns)
+    codes, n_levels = factorize_columns(df, columns)
+    pairs = list(combinations(range(len(columns)), 2))
+    jobs = [(pair, bias_correction, yates) for pair in pairs]
+
+    if max_workers == 1 or len(pairs) <= 1:
+        _init_pair_worker(codes, n_levels)
+        scores = [_pair_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_pair_worker,
+            initargs=(codes, n_levels),
+        ) as pool:
+            scores = list(pool.map(_pair_job, jobs, chunksize=8))
+
+    matrix = np.eye(len(columns))
+    for (i, j), score in zip(pairs, scores):
+        matrix[i, j] = matrix[j, i] = score
+    return pd.DataFrame(matrix, index=columns, columns=columns)
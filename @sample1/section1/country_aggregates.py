@@ -0,0 +1,209 @@
+"""
+Incremental per-country cancellation aggregates for an append-only booking CSV.
+
+The state file keeps, per country, the number of bookings, the number and sum of
+known is_canceled values and of known lead times, plus the byte offset of the last
+row already merged. Each update parses only the bytes appended since then, so the
+reservation history is never rescanned.
+
+country_stats() reproduces the groupby in analyze_cancellation_by_country on the
+preprocessed frame, including its imputation: rows without a country count towards
+the most frequent country and missing numbers count as the overall mean, exactly as
+load_and_preprocess_data fills them.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STATE_VERSION = 1
+COLUMNS = ["country", "is_canceled", "lead_time"]
+TOTALS = ["rows", "cancel_n", "cancel_sum", "lead_n", "lead_sum"]
+COUNT_DTYPES = {
+    "rows": np.int64,
+    "cancel_n": np.int64,
+    "cancel_sum": np.float64,
+    "lead_n": np.int64,
+    "lead_sum": np.float64,
+}
+MISSING_COUNTRY = ""  # key for rows without a country (blank in the CSV)
+FINGERPRINT_BYTES = 1 << 16
+CSV_CHUNKSIZE = 1_000_000
+
+
+class _ByteRange(io.RawIOBase):
+    """Read at most ``remaining`` bytes from the current position of ``f``."""
+
+    def __init__(self, f, remaining):
+        self.f = f
+        self.remaining = remaining
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.f.read(min(len(buffer), self.remaining))
+        buffer[: len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def _complete_lines_end(f, size):
+    """Offset just past the last newline; a half-written last row waits for later."""
+    pos = size
+    while pos > 0:
+        start = max(0, pos - FINGERPRINT_BYTES)
+        f.seek(start)
+        block = f.read(pos - start)
+        newline = block.rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        pos = start
+    return 0
+
+
+def _fingerprint(f, offset):
+    """Hash of the header line and the bytes just before ``offset``."""
+    digest = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    digest.update(f.readline())
+    f.seek(max(0, offset - FINGERPRINT_BYTES))
+    digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+    return digest.hexdigest()
+
+
+class CountryAggregates:
+    """
+    Per-country booking count, cancel sum and lead-time sum, merged batch by batch
+    """
+
+    def __init__(self, totals=None, header=None, offset=0, fingerprint=None):
+        if totals is None:
+            totals = pd.DataFrame(0, index=pd.Index([], name="country"), columns=TOTALS)
+        self.totals = totals
+        self.header = header
+        self.offset = offset
+        self.fingerprint = fingerprint
+
+    def reset(self):
+        self.__init__()
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION:
+            return cls()
+        totals = pd.DataFrame(state["totals"], columns=["country"] + TOTALS)
+        totals = totals.set_index("country").astype(COUNT_DTYPES)
+        return cls(totals, state["header"], state["offset"], state["fingerprint"])
+
+    def save(self, path):
+        state = {
+            "version": STATE_VERSION,
+            "header": self.header,
+            "offset": self.offset,
+            "fingerprint": self.fingerprint,
+            "totals": self.totals.reset_index().to_numpy().tolist(),
+        }
+        path = Path(path)
+        # write next to the target and swap in, so a crash never leaves a torn state
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, default=lambda x: x.item())
+        os.replace(tmp, path)
+
+    def update(self, batch):
+        """Merge a batch of raw booking rows (country, is_canceled, lead_time)."""
+        country = batch["country"].astype(object).where(batch["country"].notna())
+        frame = pd.DataFrame(
+            {
+                "country": country.fillna(MISSING_COUNTRY).to_numpy(),
+                "rows": 1,
+                "cancel_n": batch["is_canceled"].notna().to_numpy(),
+                "cancel_sum": batch["is_canceled"].fillna(0).to_numpy(),
+                "lead_n": batch["lead_time"].notna().to_numpy(),
+                "lead_sum": batch["lead_time"].fillna(0).to_numpy(),
+            }
+        )
+        sums = frame.groupby("country").sum()
+        totals = self.totals.add(sums, fill_value=0).sort_index()
+        self.totals = totals.astype(COUNT_DTYPES)
+
+    def update_from_csv(self, csv_path, chunksize=CSV_CHUNKSIZE):
+        """
+        Merge the rows appended to ``csv_path`` since the last update; rebuilds from
+        scratch if the file no longer starts with what was merged before.
+        Returns the number of rows merged.
+        """
+        with open(csv_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.offset and (
+                size < self.offset or _fingerprint(f, self.offset) != self.fingerprint
+            ):
+                self.reset()
+            end = _complete_lines_end(f, size)
+            if end <= self.offset:
+                return 0
+            f.seek(self.offset)
+            source = io.BufferedReader(_ByteRange(f, end - self.offset))
+            if self.header is None:
+                kwargs = {"header": 0}
+            else:
+                kwargs = {"header": None, "names": self.header}
+            n_rows = 0
+            reader = pd.read_csv(source, usecols=COLUMNS, chunksize=chunksize, **kwargs)
+            for chunk in reader:
+                self.update(chunk)
+                n_rows += len(chunk)
+            if self.header is None:
+                f.seek(0)
+                self.header = pd.read_csv(f, nrows=0).columns.tolist()
+            self.offset = end
+            self.fingerprint = _fingerprint(f, end)
+        return n_rows
+
+    def rebuild(self, csv_path, chunksize=CSV_CHUNKSIZE):
+        """Forget the state and aggregate the whole file again."""
+        self.reset()
+        return self.update_from_csv(csv_path, chunksize)
+
+    def country_stats(self):
+        """
+        country, booking_count, cancel_rate and avg_lead_time per country, as
+        groupby("country") gives them on the preprocessed frame
+        """
+        totals = self.totals.copy()
+        overall = totals.sum()
+        # missing numbers are filled with the overall mean of the known values
+        cancel_fill = overall["cancel_sum"] / overall["cancel_n"]
+        lead_fill = overall["lead_sum"] / overall["lead_n"]
+        if (totals["cancel_n"] < totals["rows"]).any():
+            totals["cancel_sum"] += (totals["rows"] - totals["cancel_n"]) * cancel_fill
+        if (totals["lead_n"] < totals["rows"]).any():
+            totals["lead_sum"] += (totals["rows"] - totals["lead_n"]) * lead_fill
+
+        # rows without a country are filled with the mode (ties: smallest name)
+        if MISSING_COUNTRY in totals.index:
+            missing = totals.loc[MISSING_COUNTRY]
+            totals = totals.drop(index=MISSING_COUNTRY)
+            if len(totals):
+                counts = totals["rows"]
+                mode = counts.index[counts.to_numpy() == counts.max()].min()
+                totals.loc[mode] += missing
+                totals = totals.astype(COUNT_DTYPES)
+
+        return pd.DataFrame(
+            {
+                "country": totals.index.to_numpy(),
+                "booking_count": totals["rows"].to_numpy(),
+                "cancel_rate": (totals["cancel_sum"] / totals["rows"]).to_numpy(),
+                "avg_lead_time": (totals["lead_sum"] / totals["rows"]).to_numpy(),
+            }
+        )
@@ -1,15 +1,68 @@
+import argparse
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.preprocessing import StandardScaler
-from scipy.stats import chi2_contingency
+
+from association import cramers_v_against
+from country_aggregates import CountryAggregates
 
 # Set style for plots
 plt.style.use("seaborn-v0_8")
 sns.set_theme()
 
 
+CATEGORICAL_DTYPES = ["object", "string", "category"]
+
+
+def impute_missing(df):
+    """
+    Fill missing values in one pass: numeric columns with their mean,
+    categorical columns with their mode
+    """
+    missing = df.columns[df.isna().any()]
+    if missing.empty:
+        return df
+    numerical_cols = df[missing].select_dtypes(include=[np.number]).columns
+    categorical_cols = df[missing].select_dtypes(include=CATEGORICAL_DTYPES).columns
+
+    fill_values = df[numerical_cols].mean().to_dict()
+    for col in categorical_cols:
+        counts = df[col].value_counts(sort=False)
+        if len(counts):
+            # same tie-break as Series.mode()[0]: the smallest most frequent value
+            fill_values[col] = counts.index[counts.to_numpy() == counts.max()].min()
+
+    return df.fillna(fill_values)
+
+
+def downcast_dtypes(df):
+    """
+    Shrink memory: text columns become categorical, numeric columns the
+    smallest dtype that holds every value exactly
+    """
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        if s.dtype.name in CATEGORICAL_DTYPES or pd.api.types.is_string_dtype(s):
+            s = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            s = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            values = s.to_numpy()
+            if not s.isna().any() and np.array_equal(values, np.round(values)):
+                s = pd.to_numeric(s, downcast="integer")
+            elif np.array_equal(
+                values.astype(np.float32).astype(values.dtype), values, equal_nan=True
+            ):
+                s = s.astype(np.float32)
+        columns[col] = s
+    return pd.DataFrame(columns, index=df.index)
+
+
 def load_and_preprocess_data(file_path):
     """
     Load and preprocess the hotel reservations dataset
@@ -17,15 +70,8 @@ def load_and_preprocess_data(file_path):
     # Load the dataset
     df = pd.read_csv(file_path)
 
-    # Handle missing values
-    numerical_cols = df.select_dtypes(include=[np.number]).columns
-    categorical_cols = df.select_dtypes(include=["object"]).columns
-
-    for col in numerical_cols:
-        df[col] = df[col].fillna(df[col].mean())
-
-    for col in categorical_cols:
-        df[col] = df[col].fillna(df[col].mode()[0])
+    # Handle missing values (one mean/mode lookup, one fillna)
+    df = impute_missing(df)
 
     # Convert date columns if present
     if "arrival_date" in df.columns:
@@ -33,20 +79,30 @@ def load_and_preprocess_data(file_path):
         df["arrival_month"] = df["arrival_date"].dt.month
         df["arrival_year"] = df["arrival_date"].dt.year
 
-    return df
+    # Categorical text columns and downcast numerics
+    return downcast_dtypes(df)
 
 
-def analyze_cancellation_by_country(df):
+def analyze_cancellation_by_country(df, country_stats=None):
     """
-    Analyze cancellation patterns by country with improved visualization
+    Analyze cancellation patterns by country with improved visualization;
+    pass ``country_stats`` (e.g. from CountryAggregates) to skip the groupby
     """
     # Calculate cancellation rates by country
-    country_stats = (
-        df.groupby("country")
-        .agg({"is_canceled": ["count", "mean"], "lead_time": "mean"})
-        .reset_index()
-    )
-    country_stats.columns = ["country", "booking_count", "cancel_rate", "avg_lead_time"]
+    if country_stats is None:
+        country_stats = (
+            df.groupby("country", observed=True)
+            .agg({"is_canceled": ["count", "mean"], "lead_time": "mean"})
+            .reset_index()
+        )
+        country_stats.columns = [
+            "country",
+            "booking_count",
+            "cancel_rate",
+            "avg_lead_time",
+        ]
+        # plain strings, as CountryAggregates.country_stats gives them
+        country_stats["country"] = country_stats["country"].astype(str)
 
     # Filter countries with at least 10 bookings
     country_stats = country_stats[country_stats["booking_count"] >= 10]
@@ -101,16 +157,6 @@ def analyze_cancellation_by_country(df):
     return top_6, other_sample
 
 
-def calculate_cramers_v(confusion_matrix):
-    """
-    Calculate Cramer's V statistic for categorical-categorical association.
-    """
-    chi2 = chi2_contingency(confusion_matrix)[0]
-    n = confusion_matrix.sum().sum()
-    min_dim = min(confusion_matrix.shape) - 1
-    return np.sqrt(chi2 / (n * min_dim))
-
-
 def analyze_key_attributes(df):
     """
     Identify key attributes contributing to cancellations with improved visualization
@@ -120,11 +166,9 @@ def analyze_key_attributes(df):
     correlations = df[numerical_cols].corr()["is_canceled"].sort_values(ascending=False)
 
     # Calculate Cramer's V for categorical features
-    categorical_cols = df.select_dtypes(include=["object"]).columns
-    cramers_v_scores = {}
-    for col in categorical_cols:
-        confusion_matrix = pd.crosstab(df[col], df["is_canceled"])
-        cramers_v_scores[col] = calculate_cramers_v(confusion_matrix)
+    categorical_cols = df.select_dtypes(include=CATEGORICAL_DTYPES).columns
+    # (all contingency tables against is_canceled built in one bincount)
+    cramers_v_scores = cramers_v_against(df, categorical_cols, "is_canceled").to_dict()
 
     # Combine all features and their importance scores
     feature_importance = pd.DataFrame(
@@ -188,31 +232,60 @@ def analyze_key_attributes(df):
     return feature_importance
 
 
-def analyze_lead_time(df):
+LEAD_TIME_LABELS = ["Very Short", "Short", "Medium", "Long", "Very Long"]
+
+
+def grouped_mean_se(values, groups):
+    """
+    Mean, count and standard error (population std / sqrt(n)) of ``values`` per
+    group, from per-group sums and sums of squares. Only built-in groupby
+    aggregations are used, so no Python code runs per group.
+    """
+    x = pd.Series(values, dtype=float).to_numpy()
+    # centre first: variance is shift-invariant and this avoids cancellation
+    shift = np.nanmean(x) if len(x) else 0.0
+    frame = pd.DataFrame({"group": groups, "x": x - shift})
+    frame["x2"] = frame["x"] ** 2
+    sums = frame.groupby("group", observed=True).agg(
+        total=("x", "sum"), count=("x", "count"), total_sq=("x2", "sum")
+    )
+    centred_mean = sums["total"] / sums["count"]
+    variance = (sums["total_sq"] / sums["count"] - centred_mean**2).clip(lower=0)
+    return pd.DataFrame(
+        {
+            "mean": centred_mean + shift,
+            "count": sums["count"],
+            "std_error": np.sqrt(variance / sums["count"]),
+        }
+    ).reset_index()
+
+
+def analyze_lead_time(df, n_bins=5, labels=None):
     """
     Analyze the relationship between lead time and cancellations
     """
-    # Create lead time categories
-    df["lead_time_category"] = pd.qcut(
+    # Create lead time categories (on a copy; the caller's frame is not modified)
+    if labels is None and n_bins == len(LEAD_TIME_LABELS):
+        labels = LEAD_TIME_LABELS
+    lead_time_category = pd.qcut(
         df["lead_time"],
-        q=5,
-        labels=["Very Short", "Short", "Medium", "Long", "Very Long"],
-    )
+        q=n_bins,
+        labels=labels,
+        duplicates="raise" if labels else "drop",
+    ).rename("lead_time_category")
 
     # Calculate correlation coefficient
     lead_time_correlation = df["lead_time"].corr(df["is_canceled"])
 
     # Calculate cancellation rates by lead time category
-    lead_time_analysis = (
-        df.groupby("lead_time_category", observed=True)["is_canceled"]
-        .agg(["mean", "count", lambda x: np.std(x) / np.sqrt(len(x))])  # Standard error
-        .rename(columns={"mean": "cancel_rate", "<lambda_0>": "std_error"})
-    )
+    lead_time_analysis = grouped_mean_se(
+        df["is_canceled"].to_numpy(), lead_time_category
+    ).rename(columns={"group": "lead_time_category", "mean": "cancel_rate"})
 
     # Plot cancellation rate by lead time category with error bars
     plt.figure(figsize=(10, 6))
     bars = plt.bar(
-        range(5),
+        range(len(lead_time_analysis)),
         lead_time_analysis["cancel_rate"],
         yerr=lead_time_analysis["std_error"],
         capsize=5,
@@ -237,7 +310,11 @@ def analyze_lead_time(df):
     )
     plt.xlabel("Lead Time Category")
     plt.ylabel("Cancellation Rate")
-    plt.xticks(range(5), lead_time_analysis.index, rotation=45)
+    plt.xticks(
+        range(len(lead_time_analysis)),
+        lead_time_analysis["lead_time_category"].astype(str),
+        rotation=45,
+    )
 
     plt.tight_layout()
     plt.savefig("lead_time_analysis.png", dpi=300, bbox_inches="tight")
@@ -246,9 +323,44 @@ def analyze_lead_time(df):
     return lead_time_analysis, lead_time_correlation
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel cancellation analysis")
+    parser.add_argument("--data", default="../data/hotel-reservations.csv")
+    parser.add_argument(
+        "--country-state",
+        help="JSON state of incremental per-country aggregates; only rows "
+        "appended to --data since the last run are read, and only the country "
+        "report is produced (the other analyses need the whole history)",
+    )
+    parser.add_argument(
+        "--rebuild-country-state",
+        action="store_true",
+        help="re-aggregate --data from scratch into --country-state",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.country_state:
+        # Per-country aggregates: merge only the new bookings into the stored state
+        state_path = Path(args.country_state)
+        if state_path.is_file() and not args.rebuild_country_state:
+            aggregates = CountryAggregates.load(state_path)
+        else:
+            aggregates = CountryAggregates()
+        aggregates.update_from_csv(args.data)
+        aggregates.save(state_path)
+        top_countries, _ = analyze_cancellation_by_country(
+            None, aggregates.country_stats()
+        )
+        print("\nTop 6 Countries with Highest Cancellation Rates:")
+        print(top_countries[["country", "cancel_rate", "booking_count"]])
+        return
+
     # Load and preprocess data
-    df = load_and_preprocess_data("../data/hotel-reservations.csv")
+    df = load_and_preprocess_data(args.data)
 
     # Perform analyses
     top_countries, other_countries = analyze_cancellation_by_country(df)
@@ -264,7 +376,7 @@ def main():
 
     print("\nLead Time Impact on Cancellations:")
     print(f"Correlation coefficient: {lead_time_corr:.3f}")
-    print(lead_time_analysis)
+    print(lead_time_analysis.to_string(index=False))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,343 @@
+"""
+Save, batch-score and serve the hotel cancellation models.
+
+An artifact is one joblib file holding the feature list, the fitted StandardScaler
+and the model, written uncompressed so its numpy arrays are memory-mapped on load.
+Tree models are stored as their compiled node arrays (datatools/tree_inference.py),
+which are plain ndarrays: every worker process maps the same pages instead of
+holding its own copy, as it would of a pickled sklearn forest (its Tree objects
+copy their nodes when unpickled). Per row, the compiled walk is slower than
+sklearn's Cython loop on large chunks but faster on the small batches the server
+scores, and it gives the same probabilities.
+
+    python cancellation_service.py train --model "Random Forest" --out rf.joblib
+    python cancellation_service.py score rf.joblib bookings.csv scores.csv
+    python cancellation_service.py serve rf.joblib --port 8000
+
+The server accepts POST /predict with {"rows": [{feature: value, ...}, ...]} and
+answers {"probability": [...], "prediction": [...]}. Concurrent requests are
+collected into micro-batches, so the model is called once per batch.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+# repository root, for the helpers shared with the other course scripts (datatools/)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from datatools.tree_inference import compile_trees  # noqa: E402
+
+from classification_evaluation import (  # noqa: E402
+    DATA_PATH,
+    FEATURES,
+    MODELS,
+    load_data,
+)
+
+ARTIFACT_FORMAT = 2
+SCORE_CHUNKSIZE = 100_000
+MAX_BATCH = 256
+MAX_WAIT_MS = 5
+
+
+def build_artifact(X, y, model_name="Random Forest", seed=42):
+    """
+    Fit the scaler and the named model from MODELS on all of X; tree models are
+    kept as their compiled node arrays
+    """
+    scaler = StandardScaler().fit(X)
+    estimator, params = MODELS[model_name]
+    model = estimator(random_state=seed, **params).fit(scaler.transform(X), y)
+    classes = model.classes_
+    try:
+        model = compile_trees(model)
+    except TypeError:  # not a tree model
+        pass
+    return {
+        "format": ARTIFACT_FORMAT,
+        "model_name": model_name,
+        "features": list(FEATURES),
+        "scaler": scaler,
+        "model": model,
+        "classes": classes,
+    }
+
+
+def save_artifact(artifact, path):
+    # uncompressed, so numpy arrays can be memory-mapped by load_artifact
+    joblib.dump(artifact, path, compress=0)
+
+
+def load_artifact(path, mmap=True):
+    artifact = joblib.load(path, mmap_mode="r" if mmap else None)
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path}: unsupported artifact format")
+    return artifact
+
+
+def score_frame(artifact, frame):
+    """Cancellation probability and predicted class for every row of ``frame``."""
+    X = artifact["scaler"].transform(frame[artifact["features"]].to_numpy(dtype=float))
+    proba = artifact["model"].predict_proba(X)
+    classes = artifact["classes"]
+    # same as model.predict, without a second pass over the trees
+    prediction = classes.take(np.argmax(proba, axis=1))
+    positive = list(classes).index(1) if 1 in classes else -1
+    return proba[:, positive], prediction
+
+
+# Artifact of the current scoring worker, loaded once by the pool initializer
+_artifact = None
+
+
+def _init_scorer(path):
+    global _artifact
+    _artifact = load_artifact(path)
+
+
+def _score_chunk(frame):
+    probability, prediction = score_frame(_artifact, frame)
+    return pd.DataFrame(
+        {"cancel_probability": probability, "predicted_canceled": prediction},
+        index=frame.index,
+    )
+
+
+def score_file(
+    artifact_path,
+    csv_path,
+    out_path,
+    chunksize=SCORE_CHUNKSIZE,
+    workers=None,
+    keep=(),
+):
+    """
+    Score a reservation CSV chunk by chunk across worker processes and write the
+    scores (plus the ``keep`` columns) to ``out_path`` in input order.
+    Returns the number of rows scored.
+    """
+    artifact = load_artifact(artifact_path)
+    usecols = list(dict.fromkeys(list(keep) + artifact["features"]))
+    chunks = pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize)
+    workers = workers or os.cpu_count() or 1
+    n_rows = 0
+
+    with open(out_path, "w", newline="") as out:
+
+        def write(chunk, scores):
+            nonlocal n_rows
+            result = pd.concat([chunk[list(keep)], scores], axis=1)
+            result.to_csv(out, index=False, header=n_rows == 0)
+            n_rows += len(result)
+
+        if workers == 1:
+            _init_scorer(artifact_path)
+            for chunk in chunks:
+                write(chunk, _score_chunk(chunk))
+            return n_rows
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_scorer, initargs=(artifact_path,)
+        ) as pool:
+            # keep a bounded number of chunks in flight so memory stays flat
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_score_chunk, chunk)))
+                if len(pending) >= 2 * workers:
+                    chunk, future = pending.popleft()
+                    write(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                write(chunk, future.result())
+    return n_rows
+
+
+class MicroBatcher:
+    """
+    Collect rows from concurrent callers and score them together: a batch is
+    scored once ``max_batch`` rows are waiting or the oldest has waited
+    ``max_wait_ms``
+    """
+
+    def __init__(self, artifact, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.artifact = artifact
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, frame):
+        """Queue ``frame``; the Future resolves to (probability, prediction)."""
+        future = Future()
+        self.requests.put((frame, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self.requests.get()]
+            n_rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while n_rows < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+                n_rows += len(batch[-1][0])
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            frame = pd.concat([frame for frame, _ in batch], ignore_index=True)
+            probability, prediction = score_frame(self.artifact, frame)
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            # one bad request must not fail the others: score them one by one
+            for request in batch:
+                self._score([request])
+            return
+        start = 0
+        for frame, future in batch:
+            stop = start + len(frame)
+            future.set_result((probability[start:stop], prediction[start:stop]))
+            start = stop
+
+
+def make_handler(batcher):
+    class PredictHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers["Content-Length"])
+                body = json.loads(self.rfile.read(length))
+                rows = body.get("rows", body) if isinstance(body, dict) else body
+                frame = pd.DataFrame(rows if isinstance(rows, list) else [rows])
+                missing = set(batcher.artifact["features"]) - set(frame.columns)
+                if missing:
+                    raise ValueError(f"missing features: {sorted(missing)}")
+                # reject non-numeric values here rather than in the shared batch
+                frame[batcher.artifact["features"]].to_numpy(dtype=float)
+            except (ValueError, KeyError, TypeError) as exc:
+                self._reply(400, {"error": str(exc)})
+                return
+            try:
+                probability, prediction = batcher.submit(frame).result()
+            except Exception as exc:
+                self._reply(500, {"error": str(exc)})
+                return
+            self._reply(
+                200,
+                {
+                    "probability": probability.tolist(),
+                    "prediction": prediction.tolist(),
+                },
+            )
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictHandler
+
+
+class PredictServer(ThreadingHTTPServer):
+    # the default listen backlog of 5 drops connections under concurrent load
+    request_queue_size = 128
+
+
+def serve(artifact_path, host="127.0.0.1", port=8000, **batch_options):
+    batcher = MicroBatcher(load_artifact(artifact_path), **batch_options)
+    server = PredictServer((host, port), make_handler(batcher))
+    print(f"Serving {artifact_path} on http://{host}:{server.server_port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel cancellation model service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="fit a model and save its artifact")
+    train.add_argument("--data", default=DATA_PATH)
+    train.add_argument("--model", choices=list(MODELS), default="Random Forest")
+    train.add_argument("--seed", type=int, default=42)
+    train.add_argument("--out", required=True)
+
+    score = commands.add_parser("score", help="score a reservation CSV")
+    score.add_argument("artifact")
+    score.add_argument("csv")
+    score.add_argument("out")
+    score.add_argument("--chunksize", type=int, default=SCORE_CHUNKSIZE)
+    score.add_argument("--workers", type=int, default=None)
+    score.add_argument(
+        "--keep", nargs="*", default=[], help="input columns copied to the output"
+    )
+
+    server = commands.add_parser("serve", help="HTTP endpoint with micro-batching")
+    server.add_argument("artifact")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8000)
+    server.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    server.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "train":
+        X, y = load_data(args.data)
+        save_artifact(build_artifact(X, y, args.model, args.seed), args.out)
+        print(f"Saved {args.model} artifact to {args.out}")
+    elif args.command == "score":
+        n_rows = score_file(
+            args.artifact,
+            args.csv,
+            args.out,
+            chunksize=args.chunksize,
+            workers=args.workers,
+            keep=args.keep,
+        )
+        print(f"Scored {n_rows} rows into {args.out}")
+    else:
+        serve(
+            args.artifact,
+            host=args.host,
+            port=args.port,
+            max_batch=args.max_batch,
+            max_wait_ms=args.max_wait_ms,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,70 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-# Read the dataset
-df = pd.read_csv("../data/hotel-reservations.csv")
+DATA_PATH = "../data/hotel-reservations.csv"
+CHUNKSIZE = 100_000
+SGD_EPOCHS = 5
 
 # Select relevant features for prediction
-features = [
+FEATURES = [
     "lead_time",
     "adr",
     "total_of_special_requests",
     "previous_cancellations",
     "previous_bookings_not_canceled",
 ]
-X = df[features]
-y = df["is_canceled"]
+TARGET = "is_canceled"
+
+# Different split ratios
+SPLIT_RATIOS = [(0.8, 0.2), (0.7, 0.3), (0.6, 0.4)]
+SEEDS = [42]
+
+# Models to evaluate: name -> (estimator class, parameters); the seed is added
+# as random_state, and slowest models come first so the pool stays busy
+MODELS = {
+    "Random Forest": (RandomForestClassifier, {}),
+    "Logistic Regression": (LogisticRegression, {"max_iter": 1000}),
+}
 
-# Scale the features
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
 
-# Dictionary to store results
-results = {}
+def load_data(path=DATA_PATH):
+    df = pd.read_csv(path, usecols=FEATURES + [TARGET])
+    return df[FEATURES].to_numpy(dtype=float), df[TARGET].to_numpy()
+
+
+# Scaled splits by (test_size, seed), shared by every job of the current process
+# (set once per pool worker)
+_splits = None
+
+
+def _init_worker(splits):
+    global _splits
+    _splits = splits
+
+
+def scaled_split(X, y, test_size, seed):
+    """Train/test split with the scaler fitted on the training part only"""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=seed
+    )
+    scaler = StandardScaler().fit(X_train)
+    return scaler.transform(X_train), scaler.transform(X_test), y_train, y_test
 
 
 # Function to evaluate model
-def evaluate_model(model, X_train, X_test, y_train, y_test, model_name, split_ratio):
+def evaluate_model(model, X_train, X_test, y_train, y_test):
     model.fit(X_train, y_train)
     y_pred = model.predict(X_test)
     accuracy = accuracy_score(y_test, y_pred)
@@ -39,66 +72,238 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, model_name, split_ra
     return accuracy, report
 
 
-# Different split ratios
-split_ratios = [(0.8, 0.2), (0.7, 0.3), (0.6, 0.4)]
+def _run_job(job):
+    model_name, train_size, test_size, seed = job
+    X_train, X_test, y_train, y_test = _splits[test_size, seed]
+    estimator, params = MODELS[model_name]
+    start = time.perf_counter()
+    accuracy, report = evaluate_model(
+        estimator(random_state=seed, **params), X_train, X_test, y_train, y_test
+    )
+    return {
+        "model": model_name,
+        "split": f"{round(train_size * 100)}/{round(test_size * 100)}",
+        "train_size": train_size,
+        "test_size": test_size,
+        "seed": seed,
+        "accuracy": accuracy,
+        "report": report,
+        "seconds": time.perf_counter() - start,
+    }
 
-# Models to evaluate
-models = {
-    "Random Forest": RandomForestClassifier(random_state=42),
-    "Logistic Regression": LogisticRegression(random_state=42, max_iter=1000),
-}
 
-# Evaluate models with different split ratios
-for train_size, test_size in split_ratios:
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_scaled, y, test_size=test_size, random_state=42
+def run_evaluation(
+    X, y, models=None, split_ratios=SPLIT_RATIOS, seeds=SEEDS, max_workers=None
+):
+    """
+    Evaluate every (model x split x seed) combination, on a process pool unless
+    ``max_workers`` is 1; returns one row per combination
+    """
+    models = list(MODELS) if models is None else list(models)
+    jobs = [
+        (model_name, train_size, test_size, seed)
+        for seed in seeds
+        for train_size, test_size in split_ratios
+        for model_name in models
+    ]
+    # hand out the slowest models (listed first in MODELS) first
+    order = sorted(range(len(jobs)), key=lambda i: models.index(jobs[i][0]))
+    # split and scale once here, so every model of a split reuses the same matrices
+    splits = {
+        (test_size, seed): scaled_split(X, y, test_size, seed)
+        for seed in seeds
+        for _, test_size in split_ratios
+    }
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) == 1:
+        _init_worker(splits)
+        rows = [_run_job(job) for job in jobs]
+    else:
+        # each worker receives the scaled splits once, through the initializer
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(splits,)
+        ) as pool:
+            done = pool.map(_run_job, [jobs[i] for i in order])
+            rows = [row for _, row in sorted(zip(order, done), key=lambda p: p[0])]
+    return pd.DataFrame(rows)
+
+
+def iter_split_chunks(path, test_size, seed, chunksize=CHUNKSIZE):
+    """
+    Stream (X_train, X_test, y_train, y_test) per CSV chunk; each row goes to the
+    test part with probability ``test_size``, drawn from a generator seeded with
+    ``seed`` so every pass over the file sees the same split
+    """
+    rng = np.random.default_rng(seed)
+    for chunk in pd.read_csv(path, usecols=FEATURES + [TARGET], chunksize=chunksize):
+        X = chunk[FEATURES].to_numpy(dtype=float)
+        y = chunk[TARGET].to_numpy()
+        is_test = rng.random(len(chunk)) < test_size
+        yield X[~is_test], X[is_test], y[~is_test], y[is_test]
+
+
+def report_from_confusion(counts, labels, digits=2):
+    """
+    The text of sklearn's classification_report, computed from a confusion matrix
+    so the predictions themselves never have to be kept
+    """
+    k = len(labels)
+    scores = classification_report(
+        np.repeat(labels, k),
+        np.tile(labels, k),
+        labels=labels,
+        sample_weight=counts.ravel(),
+        output_dict=True,
+        zero_division=0,
     )
+    names = [str(label) for label in labels]
+    width = max(len(name) for name in names + ["weighted avg"])
+    headers = ["precision", "recall", "f1-score", "support"]
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
 
-    for model_name, model in models.items():
-        accuracy, report = evaluate_model(
-            model,
-            X_train,
-            X_test,
-            y_train,
-            y_test,
-            model_name,
-            f"{int(train_size*100)}/{int(test_size*100)}",
+    report = ("{:>{width}s} " + " {:>9}" * 4).format("", *headers, width=width)
+    report += "\n\n"
+    for name in names:
+        row = scores[name]
+        report += row_fmt.format(
+            name,
+            row["precision"],
+            row["recall"],
+            row["f1-score"],
+            int(round(row["support"])),
+            width=width,
+            digits=digits,
+        )
+    total = int(counts.sum())
+    report += "\n"
+    report += (
+        "{:>{width}s} " + " {:>9.{digits}}" * 2 + " {:>9.{digits}f}" + " {:>9}\n"
+    ).format("accuracy", "", "", scores["accuracy"], total, width=width, digits=digits)
+    for average in ("macro avg", "weighted avg"):
+        row = scores[average]
+        report += row_fmt.format(
+            average,
+            row["precision"],
+            row["recall"],
+            row["f1-score"],
+            total,
+            width=width,
+            digits=digits,
         )
+    return report
 
-        key = f"{model_name}_{int(train_size*100)}_{int(test_size*100)}"
-        results[key] = {"accuracy": accuracy, "report": report}
 
-# Create visualization for accuracy comparison
-plt.figure(figsize=(12, 6))
-split_labels = ["80/20", "70/30", "60/40"]
-rf_accuracies = [
-    results[f"Random Forest_{int(split[0]*100)}_{int(split[1]*100)}"]["accuracy"]
-    for split in split_ratios
-]
-lr_accuracies = [
-    results[f"Logistic Regression_{int(split[0]*100)}_{int(split[1]*100)}"]["accuracy"]
-    for split in split_ratios
-]
+def evaluate_out_of_core(path, test_size, seed, chunksize=CHUNKSIZE, epochs=SGD_EPOCHS):
+    """
+    Logistic regression trained by SGD over CSV chunks: one pass fits the scaler
+    (partial_fit), ``epochs`` passes train the model and a last pass scores the
+    test rows. Memory depends on ``chunksize`` only, not on the number of bookings.
+    """
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    classes = np.array([], dtype=np.int64)
+    for X_train, _, y_train, _ in iter_split_chunks(path, test_size, seed, chunksize):
+        scaler.partial_fit(X_train)
+        classes = np.union1d(classes, y_train)
 
-x = np.arange(len(split_labels))
-width = 0.35
+    model = SGDClassifier(loss="log_loss", random_state=seed)
+    for _ in range(epochs):
+        for X_train, _, y_train, _ in iter_split_chunks(
+            path, test_size, seed, chunksize
+        ):
+            model.partial_fit(scaler.transform(X_train), y_train, classes=classes)
+
+    counts = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    for _, X_test, _, y_test in iter_split_chunks(path, test_size, seed, chunksize):
+        y_pred = model.predict(scaler.transform(X_test))
+        counts += confusion_matrix(y_test, y_pred, labels=classes)
+
+    return {
+        "model": "SGD Logistic Regression (out-of-core)",
+        "split": f"{round((1 - test_size) * 100)}/{round(test_size * 100)}",
+        "train_size": 1 - test_size,
+        "test_size": test_size,
+        "seed": seed,
+        "accuracy": np.trace(counts) / counts.sum(),
+        "report": report_from_confusion(counts, classes),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def plot_accuracy(results, path="model_comparison.png"):
+    # Create visualization for accuracy comparison (mean over seeds)
+    accuracy = results.pivot_table(
+        index="split", columns="model", values="accuracy", sort=False
+    )
+    plt.figure(figsize=(12, 6))
+    x = np.arange(len(accuracy.index))
+    width = 0.8 / len(accuracy.columns)
 
-plt.bar(x - width / 2, rf_accuracies, width, label="Random Forest")
-plt.bar(x + width / 2, lr_accuracies, width, label="Logistic Regression")
+    for i, model_name in enumerate(accuracy.columns):
+        offset = (i - (len(accuracy.columns) - 1) / 2) * width
+        plt.bar(x + offset, accuracy[model_name], width, label=model_name)
+
+    plt.xlabel("Train/Test Split Ratio")
+    plt.ylabel("Accuracy")
+    plt.title("Model Performance Comparison")
+    plt.xticks(x, accuracy.index)
+    plt.legend()
+
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel cancellation classifiers")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="also train SGD logistic regression by streaming the CSV in chunks",
+    )
+    parser.add_argument(
+        "--out-of-core-only",
+        action="store_true",
+        help="skip the in-memory models (for files that do not fit in RAM)",
+    )
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--epochs", type=int, default=SGD_EPOCHS)
+    parser.add_argument("--workers", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    frames = []
+    if not args.out_of_core_only:
+        X, y = load_data(args.data)
+        frames.append(run_evaluation(X, y, max_workers=args.workers))
+    if args.out_of_core or args.out_of_core_only:
+        frames.append(
+            pd.DataFrame(
+                [
+                    evaluate_out_of_core(
+                        args.data, test_size, seed, args.chunksize, args.epochs
+                    )
+                    for seed in SEEDS
+                    for _, test_size in SPLIT_RATIOS
+                ]
+            )
+        )
+    results = pd.concat(frames, ignore_index=True)
+    plot_accuracy(results)
 
-plt.xlabel("Train/Test Split Ratio")
-plt.ylabel("Accuracy")
-plt.title("Model Performance Comparison")
-plt.xticks(x, split_labels)
-plt.legend()
+    # Print results
+    for row in results.itertuples():
+        key = f"{row.model}_{row.split.replace('/', '_')}"
+        if len(SEEDS) > 1:
+            key += f"_seed{row.seed}"
+        print(f"\n{key} Results:")
+        print(f"Accuracy: {row.accuracy:.4f}")
+        print("Classification Report:")
+        print(row.report)
 
-plt.tight_layout()
-plt.savefig("model_comparison.png")
-plt.close()
 
-# Print results
-for key, value in results.items():
-    print(f"\n{key} Results:")
-    print(f"Accuracy: {value['accuracy']:.4f}")
-    print("Classification Report:")
-    print(value["report"])
+if __name__ == "__main__":
+    main()
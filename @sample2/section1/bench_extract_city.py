@@ -0,0 +1,47 @@
+"""Benchmark the vectorized city extractor against the per-row ``apply(extract_city)`` version.
+
+Run from this directory: ``python bench_extract_city.py [n_rows]``.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from price_analysis import cleaning
+
+
+def make_addresses(n_rows: int, seed: int = 0) -> pd.Series:
+    """Sample ``n_rows`` addresses (with heavy repetition) from the train split, plus blanks and NaN."""
+    pool = pd.read_csv(cleaning.TRAIN_CSV, usecols=["Address"])["Address"]
+    pool = pd.concat([pool, pd.Series([np.nan, "", "  ", "Yerevan ›  ", "Gyumri, "])], ignore_index=True)
+    rng = np.random.default_rng(seed)
+    return pd.Series(pool.to_numpy(dtype=object)[rng.integers(0, len(pool), n_rows)])
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    addresses = make_addresses(n_rows)
+    print(f"{n_rows:,} rows, {addresses.nunique(dropna=False):,} distinct addresses")
+
+    expected, t_apply = timed(lambda s: s.apply(cleaning.extract_city), addresses)
+    cleaning._city_cache.clear()
+    cold, t_cold = timed(cleaning.extract_cities, addresses)
+    warm, t_warm = timed(cleaning.extract_cities, addresses)
+    pd.testing.assert_series_equal(cold, expected, check_dtype=False)
+    pd.testing.assert_series_equal(warm, expected, check_dtype=False)
+
+    print(f"apply(extract_city):     {t_apply:8.3f}s")
+    print(f"extract_cities (cold):   {t_cold:8.3f}s  ({t_apply / t_cold:5.1f}x)")
+    print(f"extract_cities (cached): {t_warm:8.3f}s  ({t_apply / t_warm:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
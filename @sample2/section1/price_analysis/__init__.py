@@ -0,0 +1,44 @@
+"""Apartment-for-rent price analysis.
+
+Importing the package only loads the cleaning helpers (pandas/numpy); ``run`` pulls in the
+modelling and plotting stages on demand.
+"""
+
+from .cleaning import (
+    BALCONY_MAP,
+    BOOL_COLS,
+    CAT_COLS,
+    CITY_MAP,
+    CONSTRUCTION_MAP,
+    CURRENCY_RATES,
+    FURNITURE_MAP,
+    NUM_COLS,
+    TEST_CSV,
+    TRAIN_CSV,
+    clean_frame,
+    extract_cities,
+    extract_city,
+    load_and_prepare,
+    stream_prepare,
+)
+from .pipeline import Config, run
+
+__all__ = [
+    "BALCONY_MAP",
+    "BOOL_COLS",
+    "CAT_COLS",
+    "CITY_MAP",
+    "CONSTRUCTION_MAP",
+    "CURRENCY_RATES",
+    "FURNITURE_MAP",
+    "NUM_COLS",
+    "TEST_CSV",
+    "TRAIN_CSV",
+    "Config",
+    "clean_frame",
+    "extract_cities",
+    "extract_city",
+    "load_and_prepare",
+    "run",
+    "stream_prepare",
+]
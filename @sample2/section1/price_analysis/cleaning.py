@@ -0,0 +1,405 @@
+"""Loading and cleaning of the apartment-for-rent splits.
+
+Only pandas and numpy are imported here, so the maps and helpers can be reused without pulling in
+the modelling and plotting stacks.
+"""
+
+import sys
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from collections import OrderedDict
+
+from .rates import usd_rates
+
+# repository root, for the helpers shared with the other course scripts (datatools/)
+_REPO_ROOT = str(Path(__file__).resolve().parents[3])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+from datatools.dates import parse_dates  # noqa: E402
+
+# ---------- 0. configuration ----------
+DATA_DIR = Path("../data")
+TRAIN_CSV = DATA_DIR / "apartment_for_rent_train.csv"
+TEST_CSV = DATA_DIR / "apartment_for_rent_test.csv"
+
+
+# ---------- 1. utility: canonical mappers ----------
+BALCONY_MAP = {
+    "closed balcony": "Closed balcony",
+    "closed_balcony": "Closed balcony",
+    "closed": "Closed balcony",
+    "open balcony": "Open balcony",
+    "open_balcony": "Open balcony",
+    "open": "Open balcony",
+    "multiple balconies": "Multiple balconies",
+    "multiple_balconies": "Multiple balconies",
+    "multible": "Multiple balconies",
+    "0": "Not available",
+    "none": "Not available",
+    "nan": "Not available",
+    "": "Not available",
+    "not available": "Not available",
+    "not_available": "Not available",
+}
+CONSTRUCTION_MAP = {"monolith": "Monolith", "stone": "Stone", "panels": "Panels", "bricks": "Bricks"}
+FURNITURE_MAP = {
+    "available": "Available",
+    "by agreement": "By agreement",
+    "partial furniture": "Partial",
+    "not available": "Not available",
+    "": "Unknown",
+    "nan": "Unknown",
+    "none": "Unknown",
+}
+# This should be updated with the latest exchange rates
+CURRENCY_RATES = {
+    "AMD": 0.0026,
+    "USD": 1.0,
+    "RUB": 0.011,
+    "EUR": 1.07,
+}
+BOOL_COLS = ["New_construction", "Elevator"]
+NUM_COLS = [
+    "Number_of_rooms",
+    "Number_of_bathrooms",
+    "Floor_area",
+    "Ceiling_height",
+    "Floors_in_the_building",
+    "Floor",
+]
+CAT_COLS = [
+    "Balcony",
+    "Furniture",
+    "Renovation",
+    "Children_are_welcome",
+    "Pets_allowed",
+    "Utility_payments",
+    "Construction_type",
+]
+CITY_MAP = {
+    "Yerevan": "Yerevan",
+    "Երևան": "Yerevan",
+    "Ереван": "Yerevan",
+    "Artashat": "Artashat",
+    "Echmiadzin": "Echmiadzin",
+    "Vardenis": "Vardenis",
+    "Tsaghkadzor": "Tsaghkadzor",
+    "Gyumri": "Gyumri",
+    "Dilijan": "Dilijan",
+}
+
+
+def extract_city(address: str) -> str:
+    """Extract city name from address string."""
+    if pd.isna(address) or not isinstance(address, str) or not address.strip():
+        return "Unknown"
+    # Split address and check each part
+    parts = address.split("›")
+    if len(parts) > 1:
+        city_part = parts[-1].strip()
+    else:
+        # Try to extract from comma-separated format
+        parts = address.split(",")
+        city_part = parts[-1].strip()
+    # Add empty string check
+    if not city_part:
+        return "Unknown"
+    # Clean and map city names
+    try:
+        city = city_part.split()[0]  # Take first word
+        return CITY_MAP.get(city, "Other")
+    except (IndexError, AttributeError):
+        return "Unknown"
+
+
+CITY_CACHE_SIZE = 100_000
+_city_cache = OrderedDict()  # raw address -> city, kept across calls for incremental runs
+
+
+def _cities_of(addresses: pd.Series) -> np.ndarray:
+    """Vectorized ``extract_city`` over an object Series of (distinct) raw addresses."""
+    text = addresses.where(addresses.map(type).eq(str), "")
+    has_arrow = text.str.contains("›", regex=False)
+    city_part = text.str.rsplit("›", n=1).str[-1].where(has_arrow, text.str.rsplit(",", n=1).str[-1])
+    first_word = city_part.str.split(n=1).str[0]  # NaN when the address or its city part is blank
+    cities = first_word.map(CITY_MAP).fillna("Other")
+    return cities.where(first_word.notna(), "Unknown").to_numpy(dtype=object)
+
+
+def extract_cities(addresses: pd.Series) -> pd.Series:
+    """Same result as ``addresses.apply(extract_city)``, but each distinct address is parsed only once.
+
+    Addresses already seen in earlier calls are served from an LRU cache of ``CITY_CACHE_SIZE`` entries.
+    """
+    codes, uniques = pd.factorize(addresses)
+    uniques = np.asarray(uniques, dtype=object)
+    hit = np.fromiter((a in _city_cache for a in uniques), dtype=bool, count=len(uniques))
+    cities = np.empty(len(uniques) + 1, dtype=object)
+    cities[-1] = "Unknown"  # code -1: missing address
+    for i in np.flatnonzero(hit):
+        _city_cache.move_to_end(uniques[i])
+        cities[i] = _city_cache[uniques[i]]
+    miss = np.flatnonzero(~hit)
+    if len(miss):
+        cities[miss] = _cities_of(pd.Series(uniques[miss], dtype=object))
+        _city_cache.update(zip(uniques[miss], cities[miss]))
+        while len(_city_cache) > CITY_CACHE_SIZE:
+            _city_cache.popitem(last=False)
+    return pd.Series(cities[codes], index=addresses.index, name=addresses.name)
+
+
+# ---------- 1. common utility ----------
+PERSONAL_COLS = ["Reg_id", "Gender", "Age"]
+DROP_COLS = [
+    "Price",
+    "Price_usd",
+    "Duration",
+    "Duration_days",
+    "Currency",
+    "Address",
+    "Datetime",
+    "amenities",
+    "appliances",
+    "parking",
+]
+PRICE_MIN, PRICE_MAX = 50, 10000
+STREAM_CHUNKSIZE = 200_000
+
+
+def clean_categorical(s: pd.Series, clean) -> pd.Series:
+    """Apply the vectorized string cleaner ``clean`` to the distinct values of ``s`` and return a categorical.
+
+    The column is factorized once, ``clean`` runs on the uniques (plus one slot standing for missing
+    values), and the codes are remapped onto the cleaned categories, so cost scales with cardinality.
+    """
+    codes, uniques = pd.factorize(s)
+    cleaned = clean(pd.Series(list(uniques) + [np.nan], dtype=object))
+    new_codes, categories = pd.factorize(cleaned)
+    # code -1 (missing) picks the trailing slot added above
+    return pd.Series(pd.Categorical.from_codes(new_codes[codes], categories=categories), index=s.index, name=s.name)
+
+
+def collapse_rare(s: pd.Series, min_count: int, other: str = "Other") -> pd.Series:
+    """Replace values seen fewer than ``min_count`` times with ``other`` (categorical-aware)."""
+    counts = s.value_counts()
+    rare_categories = counts[counts < min_count].index
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        rare = s.isin(rare_categories)
+        if not rare.any():
+            return s
+        if other not in s.cat.categories:
+            s = s.cat.add_categories(other)
+        return s.where(~rare, other).cat.remove_unused_categories()
+    return s.replace(rare_categories, other)
+
+
+def clean_frame(df: pd.DataFrame, rate_table: pd.DataFrame = None) -> pd.DataFrame:
+    """Apply the cleaning steps shared by both splits (works on a whole split or a single chunk).
+
+    With a ``rate_table`` (see ``rates.load_rate_table``) prices are converted at the rate valid on
+    each listing's ``Datetime``; otherwise the static ``CURRENCY_RATES`` apply.
+    """
+    # Categorical columns: clean the distinct values only, then broadcast back through the codes
+    df["Balcony"] = clean_categorical(
+        df["Balcony"], lambda s: s.astype(str).str.strip().str.lower().replace(BALCONY_MAP).fillna("Not available")
+    )
+    df["Furniture"] = clean_categorical(
+        df["Furniture"], lambda s: s.astype(str).str.strip().str.lower().replace(FURNITURE_MAP).fillna("Unknown")
+    )
+    df["Construction_type"] = clean_categorical(
+        df["Construction_type"],
+        lambda s: s.fillna("Unknown").astype(str).str.strip().str.lower().replace(CONSTRUCTION_MAP),
+    )
+    df["Renovation"] = clean_categorical(
+        df["Renovation"], lambda s: s.fillna("Unknown").astype(str).str.strip().str.replace("_", " ").str.title()
+    )
+
+    # Boolean columns
+    for col in BOOL_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+    # Numeric columns with sanity limits
+    df[NUM_COLS] = df[NUM_COLS].apply(pd.to_numeric, errors="coerce")
+    df["Floors_in_the_building"] = df["Floors_in_the_building"].clip(lower=0)
+    df["Floor_area"] = df["Floor_area"].clip(lower=20, upper=1000)
+
+    # Calculate monthly price in USD
+    df["Duration_days"] = df["Duration"].str.lower().map({"daily": 1, "monthly": 30}).fillna(30).astype(int)
+    df["Datetime"] = parse_dates(df["Datetime"])
+    rate = usd_rates(df["Currency"], df["Datetime"], rate_table, fallback=CURRENCY_RATES)
+    df["Price_usd_month"] = df["Price"] * rate * (30 / df["Duration_days"])
+
+    # Address processing
+    if "Address" in df.columns:
+        df["City"] = extract_cities(df["Address"])
+
+    # Categorical columns with simple numeric encoding
+    for col in ["Children_are_welcome", "Pets_allowed", "Utility_payments"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+            df[col] = df[col].map({0: "No"}).fillna("Yes")
+            df.loc[df[col].isna(), col] = "Unknown"
+    return df
+
+
+def valid_price_mask(y: pd.Series) -> pd.Series:
+    """Rows whose monthly USD price falls inside the accepted range."""
+    return y.notna() & y.between(PRICE_MIN, PRICE_MAX)
+
+
+def detect_header_shift(header: list, ref_cols: list) -> int:
+    """Return how many positions the named columns in ``header`` sit left of their place in ``ref_cols``.
+
+    Blank trailing header fields (read by pandas as ``Unnamed: N``) are ignored.
+    """
+    named = [c for c in header if c and not str(c).startswith("Unnamed:")]
+    if not named:
+        return 0
+    try:
+        shift = ref_cols.index(named[0])
+    except ValueError:
+        raise ValueError(f"Header column {named[0]!r} not found in reference columns")
+    if ref_cols[shift : shift + len(named)] != named:
+        raise ValueError("Header columns are not a contiguous run of the reference columns")
+    return shift
+
+
+def aligned_read_kwargs(path: Path, ref_cols: list) -> dict:
+    """``pd.read_csv`` keyword arguments that map the columns of ``path`` onto ``ref_cols`` by position.
+
+    Returns an empty dict when the header is already aligned, so the file is read as-is.
+    """
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    if detect_header_shift(header, ref_cols) == 0:
+        return {}
+    n = min(len(header), len(ref_cols))
+    return {"header": 0, "names": ref_cols[:n], "usecols": range(n)}
+
+
+def load_and_prepare(train_path: Path, test_path: Path, rate_table: pd.DataFrame = None):
+    """Load CSV, clean basic issues, and prepare data for modeling."""
+    train = pd.read_csv(train_path)
+    # --- realign the test set at parse time: its header is shifted left of the data ---
+    test = pd.read_csv(test_path, **aligned_read_kwargs(test_path, train.columns.tolist()))
+    miss_cols = PERSONAL_COLS
+    # --- drop the three personal columns (not used in Task 1) ---
+    train = train.drop(columns=miss_cols)
+    test = test.drop(columns=miss_cols)
+
+    # --- keep only columns common to both splits ---
+    common = list(set(train.columns) & set(test.columns))
+    X = train[common].copy()
+    X_test = test[common].copy()
+
+    # Clean both datasets
+    for df in (X, X_test):
+        clean_frame(df, rate_table)
+
+    # Extract target and drop unnecessary columns
+    y = X["Price_usd_month"]
+    X = X.drop(columns=[c for c in DROP_COLS if c in X.columns])
+
+    # Filter valid prices and reset index
+    mask = valid_price_mask(y)
+    return X.loc[mask].reset_index(drop=True), y[mask].reset_index(drop=True), X_test
+
+
+def stream_prepare(
+    csv_path: Path,
+    out_path: Path,
+    chunksize: int = STREAM_CHUNKSIZE,
+    ref_cols: list = None,
+    rate_table: pd.DataFrame = None,
+) -> int:
+    """Clean a train-format CSV chunk by chunk and append each chunk to Parquet as one row group.
+
+    Same cleaning, currency conversion and price filtering as ``load_and_prepare``, but only one
+    chunk is held in memory at a time, so peak memory is bounded by ``chunksize`` rather than file size.
+    Pass the train columns as ``ref_cols`` to realign a test-format file with a shifted header.
+    Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    n_rows = 0
+    try:
+        read_kw = aligned_read_kwargs(csv_path, ref_cols) if ref_cols else {}
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read_kw):
+            chunk = clean_frame(chunk.drop(columns=[c for c in PERSONAL_COLS if c in chunk.columns]), rate_table)
+            chunk = chunk.loc[valid_price_mask(chunk["Price_usd_month"])]
+            chunk = chunk.drop(columns=[c for c in DROP_COLS if c in chunk.columns])
+            # keep a stable schema across chunks (to_numeric may yield int64 or float64 per chunk)
+            chunk[NUM_COLS] = chunk[NUM_COLS].astype(float)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(out_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+# def check_data_quality(X: pd.DataFrame, y: pd.Series):
+#     """Check data quality and print detailed information."""
+#     print("=== Data Quality Check ===")
+#     print(f"X shape: {X.shape}")
+#     print(f"y shape: {y.shape}")
+#     print(f"X columns: {list(X.columns)}")
+#     print(f"y name: {y.name}")
+
+#     # Check missing values
+#     print(f"\nMissing values in X:")
+#     missing_X = X.isnull().sum()
+#     print(missing_X[missing_X > 0])
+
+#     print(f"\nMissing values in y: {y.isnull().sum()}")
+
+#     # Price analysis for setting bounds
+#     print(f"\n=== Price Analysis for Bounds Setting ===")
+#     print(f"Price statistics:")
+#     print(y.describe())
+
+#     # Analyze price distribution for reasonable bounds
+#     print(f"\nPrice percentiles:")
+#     percentiles = [0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+#     for p in percentiles:
+#         print(f"  {p*100:2.0f}%: ${y.quantile(p):.0f}")
+
+#     # Currency distribution
+#     if "Currency" in X.columns:
+#         print(f"\nCurrency distribution:")
+#         print(X["Currency"].value_counts())
+
+#     # Suggest reasonable bounds
+#     print(f"\n=== Suggested Price Bounds ===")
+#     print(f"Current range: ${y.min():.0f} - ${y.max():.0f}")
+#     print(f"Suggested minimum: $10 (reasonable for daily rental)")
+#     print(f"Suggested maximum: $10,000 (reasonable for luxury apartment)")
+#     print(f"Data points outside suggested bounds: {((y < 10) | (y > 10000)).sum()}")
+
+#     # Basic statistics
+#     print(f"\nX info:")
+#     print(X.info())
+#     print(f"\ny info:")
+#     print(y.describe())
+
+#     # Data integrity check
+#     if len(X) != len(y):
+#         print("ERROR: X and y have different lengths!")
+#         return False
+
+#     if y.isnull().any():
+#         print("ERROR: y contains missing values!")
+#         return False
+
+#     return True
+
+
+# if not check_data_quality(X_train, y_train):
+#     raise ValueError("Data quality check failed!")
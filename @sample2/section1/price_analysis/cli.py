@@ -0,0 +1,60 @@
+"""Command-line entry point: ``python -m price_analysis [options]`` (run from ``section1``)."""
+
+import argparse
+from pathlib import Path
+
+from .pipeline import Config, run
+
+
+def parse_args(argv=None):
+    defaults = Config()
+    parser = argparse.ArgumentParser(prog="price_analysis", description="Apartment rental price analysis (tasks a-c).")
+    parser.add_argument("--train-csv", type=Path, default=defaults.train_csv)
+    parser.add_argument("--test-csv", type=Path, default=defaults.test_csv)
+    parser.add_argument("--rates", type=Path, default=None, help="dated currency rate table (CSV or Parquet)")
+    parser.add_argument("--plots-dir", type=Path, default=defaults.plots_dir)
+    parser.add_argument(
+        "--cache-dir", type=Path, default=defaults.cache_dir, help="cleaned-data and preprocessing cache"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="re-clean the CSVs and recompute preprocessing")
+    parser.add_argument("--n-estimators", type=int, default=defaults.n_estimators, help="trees in the forest")
+    parser.add_argument("--max-threads", type=int, default=None, help="cap on fold workers × tree threads")
+    parser.add_argument(
+        "--warm-start", action="store_true", help="grow the forest from --n-estimators until CV RMSE stabilises"
+    )
+    parser.add_argument("--max-estimators", type=int, default=defaults.max_estimators, help="warm-start tree limit")
+    parser.add_argument(
+        "--cat-encoding",
+        choices=["onehot", "capped", "hashed"],
+        default=defaults.cat_encoding,
+        help="encoding for categorical columns with more than --max-categories values",
+    )
+    parser.add_argument("--max-categories", type=int, default=defaults.max_categories)
+    parser.add_argument("--hash-features", type=int, default=defaults.hash_features, help="buckets per hashed column")
+    parser.add_argument("--no-plots", action="store_true", help="skip figure generation entirely")
+    parser.add_argument("--plot-dpi", type=int, default=None, help="override the resolution of every saved figure")
+    parser.add_argument("--plot-workers", type=int, default=None, help="processes used to render figures")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run(
+        Config(
+            train_csv=args.train_csv,
+            test_csv=args.test_csv,
+            rates_path=args.rates,
+            plots_dir=args.plots_dir,
+            plots=not args.no_plots,
+            plot_dpi=args.plot_dpi,
+            plot_workers=args.plot_workers,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            n_estimators=args.n_estimators,
+            max_threads=args.max_threads,
+            warm_start=args.warm_start,
+            max_estimators=args.max_estimators,
+            cat_encoding=args.cat_encoding,
+            max_categories=args.max_categories,
+            hash_features=args.hash_features,
+        )
+    )
@@ -0,0 +1,84 @@
+"""Content-addressed Parquet cache for the output of ``load_and_prepare``.
+
+The key combines the bytes of both input CSVs, the mapping tables as they are at call time and the
+source of the cleaning module (plus the rate file, if one is used), so editing ``CURRENCY_RATES``
+(in code or at runtime), the rate file or any cleaning step invalidates old entries automatically.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from . import cleaning, rates
+from datatools import dates
+
+CACHE_FORMAT_VERSION = 1
+
+
+def _file_digest(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def prepared_cache_key(train_path: Path, test_path: Path, rates_path: Path = None) -> str:
+    """Hash of input files, mapping tables and cleaning code that identifies one prepared dataset."""
+    tables = {
+        name: getattr(cleaning, name)
+        for name in (
+            "BALCONY_MAP",
+            "CONSTRUCTION_MAP",
+            "FURNITURE_MAP",
+            "CURRENCY_RATES",
+            "CITY_MAP",
+            "BOOL_COLS",
+            "NUM_COLS",
+            "PERSONAL_COLS",
+            "DROP_COLS",
+        )
+    }
+    tables["PRICE_RANGE"] = [cleaning.PRICE_MIN, cleaning.PRICE_MAX]
+    parts = [
+        f"format={CACHE_FORMAT_VERSION}",
+        _file_digest(train_path),
+        _file_digest(test_path),
+        json.dumps(tables, sort_keys=True, ensure_ascii=False),
+        _file_digest(Path(cleaning.__file__)),
+        _file_digest(Path(rates.__file__)),
+        _file_digest(Path(dates.__file__)),
+        _file_digest(rates_path) if rates_path else "static-rates",
+    ]
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_and_prepare_cached(train_path: Path, test_path: Path, cache_dir: Path, rates_path: Path = None):
+    """``load_and_prepare`` with results stored as Parquet (categoricals kept) under ``cache_dir``."""
+    entry = Path(cache_dir) / "prepared" / prepared_cache_key(train_path, test_path, rates_path)
+    if entry.is_dir():
+        X = pd.read_parquet(entry / "X.parquet")
+        y = pd.read_parquet(entry / "y.parquet").iloc[:, 0]
+        X_test = pd.read_parquet(entry / "X_test.parquet")
+        return X, y, X_test
+
+    rate_table = rates.load_rate_table(rates_path) if rates_path else None
+    X, y, X_test = cleaning.load_and_prepare(train_path, test_path, rate_table)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # write into a scratch directory first so a crashed run never leaves a half-written entry
+    scratch = Path(tempfile.mkdtemp(dir=entry.parent))
+    try:
+        X.to_parquet(scratch / "X.parquet", index=False)
+        y.to_frame().to_parquet(scratch / "y.parquet", index=False)
+        X_test.to_parquet(scratch / "X_test.parquet", index=False)
+        os.replace(scratch, entry)
+    except OSError:
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not entry.is_dir():
+            raise
+    return X, y, X_test
@@ -0,0 +1,76 @@
+"""Sparse categorical encodings for task c and mapping of importances back to input columns.
+
+Imported only by task c, so sklearn and scipy stay out of ``import price_analysis``.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+CAT_ENCODINGS = ("onehot", "capped", "hashed")
+
+
+class HashedColumns(BaseEstimator, TransformerMixin):
+    """Hash each column into its own block of ``n_features`` sparse (CSR) features.
+
+    Width is fixed whatever the number of categories, and keeping one block per column lets
+    importances be summed back per column.
+    """
+
+    def __init__(self, n_features: int = 64):
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = np.asarray(X).shape[1]
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=object)
+        hasher = FeatureHasher(n_features=self.n_features, input_type="string", alternate_sign=False)
+        blocks = [hasher.transform([[str(v)] for v in X[:, i]]) for i in range(X.shape[1])]
+        return sparse.hstack(blocks, format="csr")
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = [f"x{i}" for i in range(self.n_features_in_)]
+        return np.asarray([f"{col}_hash{i}" for col in input_features for i in range(self.n_features)], dtype=object)
+
+
+def categorical_pipe(encoding: str = "onehot", max_categories: int = 50, hash_features: int = 64) -> Pipeline:
+    """Impute then encode categorical columns; every option produces sparse CSR output.
+
+    ``onehot`` keeps every category, ``capped`` keeps the ``max_categories - 1`` most frequent and folds
+    the rest (and unseen values) into one infrequent column, ``hashed`` uses ``HashedColumns``.
+    """
+    if encoding == "onehot":
+        encoder = OneHotEncoder(handle_unknown="ignore")
+    elif encoding == "capped":
+        encoder = OneHotEncoder(handle_unknown="infrequent_if_exist", max_categories=max_categories)
+    elif encoding == "hashed":
+        encoder = HashedColumns(n_features=hash_features)
+    else:
+        raise ValueError(f"Unknown categorical encoding {encoding!r}; expected one of {CAT_ENCODINGS}")
+    return Pipeline([("imp", SimpleImputer(strategy="most_frequent")), ("enc", encoder)])
+
+
+def aggregate_importances(importances: pd.Series, columns: list) -> pd.Series:
+    """Sum expanded-feature importances back onto the original input columns.
+
+    Feature names look like ``<transformer>__<column>[_<category or hash bucket>]``; each one is
+    assigned to the longest input column name it starts with.
+    """
+    by_length = sorted(columns, key=len, reverse=True)
+
+    def owner(feature: str) -> str:
+        name = feature.split("__", 1)[-1]
+        for col in by_length:
+            if name == col or name.startswith(f"{col}_"):
+                return col
+        return name
+
+    return importances.groupby(importances.index.map(owner)).sum().sort_values(ascending=False)
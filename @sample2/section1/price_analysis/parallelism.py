@@ -0,0 +1,40 @@
+"""Choose how task c splits its thread budget between CV folds and forest trees."""
+
+from typing import NamedTuple, Optional
+
+# Above this many rows, fold workers (separate processes, one data copy each) cost more memory than
+# they save in wall time, so the whole budget goes to tree-level threads sharing one copy.
+LARGE_DATA_ROWS = 500_000
+
+
+class ParallelPlan(NamedTuple):
+    """Fold-level processes × tree-level threads, never exceeding ``budget`` in total."""
+
+    cv_jobs: int
+    tree_jobs: int
+    budget: int
+    reason: str
+
+    def describe(self) -> str:
+        return f"{self.cv_jobs} fold worker(s) × {self.tree_jobs} tree thread(s) of {self.budget} ({self.reason})"
+
+
+def plan_parallelism(
+    n_rows: int, n_estimators: int, n_folds: int, n_cores: Optional[int] = None, max_threads: Optional[int] = None
+) -> ParallelPlan:
+    """Split ``min(n_cores, max_threads)`` between CV folds and forest trees.
+
+    ``n_cores`` defaults to the CPUs actually available to this process (cgroup/affinity aware).
+    """
+    if n_cores is None:
+        from joblib import cpu_count
+
+        n_cores = cpu_count()
+    budget = max(1, min(n_cores, max_threads) if max_threads else n_cores)
+    if budget == 1:
+        return ParallelPlan(1, 1, 1, "single thread")
+    if n_rows >= LARGE_DATA_ROWS:
+        return ParallelPlan(1, min(budget, n_estimators), budget, "large data: trees share one copy")
+    cv_jobs = min(n_folds, budget)
+    tree_jobs = max(1, min(n_estimators, budget // cv_jobs))
+    return ParallelPlan(cv_jobs, tree_jobs, budget, "folds first, spare cores to trees")
@@ -0,0 +1,139 @@
+"""``run(config)``: load, clean, run tasks a-c, render figures and print the console summary.
+
+The task and plotting modules (scipy, sklearn, matplotlib, seaborn) are imported only inside the
+stages that need them.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .cleaning import TEST_CSV, TRAIN_CSV, load_and_prepare
+from .datacache import load_and_prepare_cached
+from .rates import load_rate_table
+
+
+@dataclass
+class Config:
+    """Settings for one analysis run (paths are relative to the working directory)."""
+
+    train_csv: Path = TRAIN_CSV
+    test_csv: Path = TEST_CSV
+    rates_path: Optional[Path] = None  # dated currency rates (CSV/Parquet); None: static CURRENCY_RATES
+    plots_dir: Path = Path("plots")
+    plots: bool = True
+    plot_dpi: Optional[int] = None  # None: keep each figure's own resolution
+    plot_workers: Optional[int] = None
+    cache_dir: Optional[Path] = Path(".cache")  # None: no cleaned-data or preprocessing cache
+    n_estimators: int = 20
+    max_threads: Optional[int] = None  # None: every core available to the process
+    warm_start: bool = False
+    max_estimators: int = 200
+    cat_encoding: str = "onehot"  # for columns with more than max_categories values: onehot/capped/hashed
+    max_categories: int = 50
+    hash_features: int = 64
+    summary: bool = True
+
+
+def run(config: Config = None) -> dict:
+    """Run the full analysis and return the task results keyed by name."""
+    config = config or Config()
+    from .tasks import task_a_discrete_vars, task_b_correlation, task_c_address_and_features
+
+    plot_jobs = [] if config.plots else None
+
+    if config.cache_dir is not None:
+        X_train, y_train, X_test = load_and_prepare_cached(
+            config.train_csv, config.test_csv, config.cache_dir, config.rates_path
+        )
+    else:
+        rate_table = load_rate_table(config.rates_path) if config.rates_path else None
+        X_train, y_train, X_test = load_and_prepare(config.train_csv, config.test_csv, rate_table)
+    top3_discrete, eta_squared, log_scores = task_a_discrete_vars(X_train, y_train, plot_jobs)
+    corr_pearson, corr_spearman = task_b_correlation(X_train, y_train, plot_jobs)
+    rmse, top3_features, timings, forest = task_c_address_and_features(
+        X_train,
+        plot_jobs,
+        cache_dir=config.cache_dir,
+        n_estimators=config.n_estimators,
+        max_threads=config.max_threads,
+        warm_start=config.warm_start,
+        max_estimators=config.max_estimators,
+        cat_encoding=config.cat_encoding,
+        max_categories=config.max_categories,
+        hash_features=config.hash_features,
+    )
+
+    if plot_jobs:
+        from .plotting import render_plots
+
+        Path(config.plots_dir).mkdir(exist_ok=True)
+        render_plots(plot_jobs, config.plots_dir, dpi=config.plot_dpi, max_workers=config.plot_workers)
+
+    results = {
+        "top3_discrete": top3_discrete,
+        "eta_squared": eta_squared,
+        "log_scores": log_scores,
+        "corr_pearson": corr_pearson,
+        "corr_spearman": corr_spearman,
+        "rmse": rmse,
+        "top3_features": top3_features,
+        "timings": timings,
+        "forest": forest,
+    }
+    if config.summary:
+        print_summary(results)
+    return results
+
+
+# ---------- **console summary** ----------
+def print_section_header(title):
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def print_correlation_matrix(matrix, title):
+    print(f"\n{title}:")
+    # Display with 2 decimal places and format the matrix
+    pd.set_option("display.precision", 2)
+    pd.set_option("display.max_columns", None)
+    print(matrix.round(2).to_string())
+
+
+def print_summary(results: dict):
+    # Task A Summary
+    print_section_header("TASK A: Top Discrete Variables Analysis")
+    for var, (f_stat, p_val) in results["top3_discrete"]:
+        significance = "***" if p_val < 0.001 else "**" if p_val < 0.01 else "*" if p_val < 0.05 else "ns"
+        print(f"{var:<20} F={f_stat:>8.1f}  p={p_val:.3e} {significance}")
+
+    # Task B Summary
+    print_section_header("TASK B: Correlation Analysis")
+    print_correlation_matrix(results["corr_pearson"], "Pearson Correlations")
+    print_correlation_matrix(results["corr_spearman"], "Spearman Correlations")
+
+    # Task C Summary
+    print_section_header("TASK C: Address and Feature Importance")
+    print(f"\nModel Performance:")
+    print(f"  • RMSE:            ${results['rmse']:>8,.0f}")
+    forest = results["forest"]
+    print(f"  • Trees:           {forest['n_estimators']:>9}")
+    print(f"  • Parallelism:     {forest['plan'].describe()}")
+    if forest["warm_start_path"]:
+        path = ", ".join(f"{n}→${r:,.0f}" for n, r in forest["warm_start_path"])
+        print(f"  • Warm start:      {path}")
+
+    print("\nTime per stage:")
+    for stage, seconds in results["timings"].items():
+        print(f"  • {stage:<28} {seconds:>7.2f}s")
+
+    print("\nTop 3 features:")
+    for name, importance in results["top3_features"].items():
+        print(f"{name:<30} {importance:.3f}")
+
+    print("\nImportance by input column:")
+    for name, importance in forest["column_importances"].head(5).items():
+        print(f"{name:<30} {importance:.3f}")
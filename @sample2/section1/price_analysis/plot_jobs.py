@@ -0,0 +1,17 @@
+"""Lightweight plot specs emitted by the analysis tasks.
+
+Each ``PlotJob`` carries only plain data (arrays, small frames, labels), so it pickles cheaply and
+can be drawn in a worker process without the tasks importing matplotlib.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class PlotJob(NamedTuple):
+    """One figure to render: renderer name, output file name, renderer inputs and save options."""
+
+    kind: str
+    filename: str
+    params: dict
+    dpi: Optional[int] = None  # None: matplotlib's default
+    tight: bool = False
@@ -0,0 +1,121 @@
+"""Renderers for ``PlotJob`` specs, run in a process pool with the non-interactive Agg backend."""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+from .plot_jobs import PlotJob  # noqa: E402
+
+
+# ---------- renderers (one per figure type) ----------
+def _render_category_box(p: dict):
+    col = p["col"]
+    data = pd.DataFrame({col: p["x"], "Price": p["price"]})
+    sample_data = pd.DataFrame({col: p["sample_x"], "Price": p["sample_price"]})
+
+    plt.figure(figsize=(10, 6))
+    sns.boxplot(x=col, y="Price", data=data, order=p["order"], width=0.5)
+    sns.swarmplot(x=col, y="Price", data=sample_data, order=p["order"], size=1, alpha=0.2, color="black")
+
+    for i, n in enumerate(p["counts"]):
+        plt.text(i, plt.ylim()[1], f"N={n}", ha="center", va="bottom")
+
+    plt.title(p["title"], pad=20)
+    plt.xlabel(col)
+    plt.ylabel("Monthly rental price (USD)")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+
+def _render_rooms_regplot(p: dict):
+    subset = pd.DataFrame({"Rooms": p["rooms"], "LogPrice": p["log_price"]})
+    plt.figure(figsize=(10, 6))
+    sns.regplot(
+        data=subset,
+        x="Rooms",
+        y="LogPrice",
+        scatter_kws={"alpha": 0.3, "s": 10},
+        line_kws={"color": "red"},
+    )
+    plt.text(
+        0.05,
+        0.95,
+        p["text"],
+        transform=plt.gca().transAxes,
+        bbox=dict(facecolor="white", alpha=0.8),
+        verticalalignment="top",
+    )
+    plt.xlabel("Number of rooms")
+    plt.ylabel("Log Monthly rental price (log1p USD)")
+    plt.title(p["title"])
+    plt.tight_layout()
+
+
+def _render_rooms_box(p: dict):
+    plt.figure(figsize=(12, 6))
+    sns.boxplot(data=pd.DataFrame({"Rooms": p["rooms"], "Price": p["price"]}), x="Rooms", y="Price")
+    plt.title("Price distribution by number of rooms")
+    plt.xlabel("Number of rooms")
+    plt.ylabel("Monthly rental price (USD)")
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+
+
+def _render_heatmap(p: dict):
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(p["matrix"], annot=True, cmap="Blues", vmin=-1, vmax=1, square=True, fmt=".2f")
+    plt.title(p["title"])
+    plt.tight_layout()
+
+
+def _render_importance(p: dict):
+    plt.figure(figsize=(10, 6))
+    pd.Series(p["values"], index=p["labels"]).plot(kind="barh")
+    plt.title("Top 10 Feature Importance")
+    plt.tight_layout()
+
+
+def _render_feature_regplot(p: dict):
+    data = pd.DataFrame({p["x_name"]: p["x"], p["y_name"]: p["y"]})
+    plt.figure(figsize=(6, 4))
+    sns.regplot(data=data, x=p["x_name"], y=p["y_name"], scatter_kws={"alpha": 0.5})
+    plt.title(f"{p['x_name']} vs Monthly Price (USD)")
+    plt.tight_layout()
+
+
+RENDERERS = {
+    "category_box": _render_category_box,
+    "rooms_regplot": _render_rooms_regplot,
+    "rooms_box": _render_rooms_box,
+    "heatmap": _render_heatmap,
+    "importance": _render_importance,
+    "feature_regplot": _render_feature_regplot,
+}
+
+
+def render_plot(job: PlotJob, out_dir: Path, dpi: Optional[int] = None) -> Path:
+    """Draw a single job and save it under ``out_dir``; ``dpi`` overrides the job's own setting."""
+    RENDERERS[job.kind](job.params)
+    path = Path(out_dir) / job.filename
+    plt.savefig(path, dpi=dpi or job.dpi, bbox_inches="tight" if job.tight else None)
+    plt.close()
+    return path
+
+
+def render_plots(jobs: list, out_dir: Path, dpi: Optional[int] = None, max_workers: Optional[int] = None) -> list:
+    """Render all jobs, in a process pool unless there is only one job or one worker."""
+    if not jobs:
+        return []
+    if max_workers == 1 or len(jobs) == 1:
+        return [render_plot(job, out_dir, dpi) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render_plot, jobs, repeat(out_dir), repeat(dpi)))
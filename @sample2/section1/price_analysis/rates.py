@@ -0,0 +1,67 @@
+"""Time-versioned currency rates: convert each listing at the rate valid on its date.
+
+A rate table is a CSV or Parquet file with ``currency``, ``date`` and ``rate_usd`` columns (one row
+per currency per date the rate took effect). Conversion is one ``pd.merge_asof`` over all rows.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RATE_COLUMNS = ["currency", "date", "rate_usd"]
+_rate_tables = {}  # (resolved path, mtime, size) -> parsed table
+
+
+def load_rate_table(path: Path) -> pd.DataFrame:
+    """Parse a rate file into a date-sorted table; parsed tables are cached per file version."""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _rate_tables:
+        table = pd.read_parquet(path) if path.suffix in (".parquet", ".pq") else pd.read_csv(path)
+        missing = [c for c in RATE_COLUMNS if c not in table.columns]
+        if missing:
+            raise ValueError(f"Rate table {path} is missing columns {missing}")
+        table = pd.DataFrame(
+            {
+                "currency": table["currency"].astype(str).str.strip(),
+                "date": pd.to_datetime(table["date"]),
+                "rate_usd": pd.to_numeric(table["rate_usd"], errors="coerce"),
+            }
+        ).dropna()
+        _rate_tables[key] = table.sort_values("date", kind="stable").reset_index(drop=True)
+    return _rate_tables[key]
+
+
+def usd_rates(
+    currency: pd.Series, when: pd.Series = None, rate_table: pd.DataFrame = None, fallback: dict = None
+) -> pd.Series:
+    """USD rate per row: the latest ``rate_table`` rate on or before ``when`` for that currency.
+
+    Rows without a dated rate (no table, missing date, or a date before the first entry) fall back
+    to the static ``fallback`` mapping, then to 1.0. ``when`` may use any datetime unit:
+
+    >>> table = pd.DataFrame({"currency": ["EUR", "EUR"], "date": pd.to_datetime(["2022-01-01", "2022-06-01"]),
+    ...                       "rate_usd": [1.1, 1.2]})
+    >>> when = pd.Series(["2022-03-01", "2021-01-01", None], dtype="datetime64[s]")
+    >>> usd_rates(pd.Series(["EUR"] * 3), when, table, fallback={"EUR": 1.05}).tolist()
+    [1.1, 1.05, 1.05]
+    """
+    rate = currency.map(fallback or {}).astype(float)
+    if rate_table is None:
+        return rate.fillna(1.0)
+
+    dated = when.notna().to_numpy()
+    left = pd.DataFrame(
+        {
+            "currency": currency.astype(str).to_numpy()[dated],
+            # merge_asof needs both keys in one unit (parse_dates gives [s], pd.to_datetime [us]/[ns])
+            "date": when.to_numpy()[dated].astype(rate_table["date"].dtype),
+            "row": np.flatnonzero(dated),
+        }
+    ).sort_values("date", kind="stable")
+    matched = pd.merge_asof(left, rate_table, on="date", by="currency", direction="backward")
+    as_of = np.full(len(currency), np.nan)
+    as_of[matched["row"].to_numpy()] = matched["rate_usd"].to_numpy()
+    return pd.Series(as_of, index=currency.index).fillna(rate).fillna(1.0)
@@ -0,0 +1,357 @@
+"""Analysis tasks a-c on the cleaned apartment data.
+
+Each task optionally appends ``PlotJob`` specs to ``plot_jobs``; rendering happens elsewhere.
+"""
+
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+from .cleaning import CAT_COLS, NUM_COLS, collapse_rare
+from .parallelism import ParallelPlan, plan_parallelism
+from .plot_jobs import PlotJob
+
+RANDOM_SEED = 42
+CV_FOLDS = 3
+WARM_START_STEP = 10  # trees added per warm-start round
+WARM_START_TOL = 0.005  # stop when CV RMSE moves by less than this fraction between rounds
+SPARSE_THRESHOLD = 0.3
+
+
+@contextmanager
+def stage_timer(timings: dict, stage: str):
+    """Add the wall time spent in the ``with`` block to ``timings[stage]``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+# =========================================================
+# Task a – three discrete variables most linked to high price
+# =========================================================
+def grouped_sums(x: pd.Series, targets: np.ndarray):
+    """Per-category count, sum and sum of squares of each target column in one ``np.bincount`` pass.
+
+    ``targets`` is an (n_rows, n_targets) array. Rows where ``x`` is missing are ignored.
+    Returns ``n`` of shape (k,) and ``sums``/``sumsq`` of shape (k, n_targets).
+    """
+    codes, uniques = pd.factorize(x)
+    valid = codes >= 0
+    codes, targets = codes[valid], targets[valid]
+    k = len(uniques)
+    n = np.bincount(codes, minlength=k)
+    sums = np.column_stack([np.bincount(codes, weights=t, minlength=k) for t in targets.T])
+    sumsq = np.column_stack([np.bincount(codes, weights=t * t, minlength=k) for t in targets.T])
+    return n, sums, sumsq
+
+
+def f_test_from_sums(n: np.ndarray, sums: np.ndarray, sumsq: np.ndarray):
+    """F statistic and p-value per target from grouped sufficient statistics.
+
+    Two groups → Welch t (reported as F = t²), three or more → one-way ANOVA, matching
+    ``stats.ttest_ind(equal_var=False)`` and ``stats.f_oneway`` on the raw groups.
+    """
+    n = n[:, None].astype(float)
+    means = sums / n
+    ss_within_g = sumsq - sums**2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if len(n) == 2:  # binary → Welch t
+            v = ss_within_g / (n - 1) / n
+            se2 = v.sum(axis=0)
+            t = (means[0] - means[1]) / np.sqrt(se2)
+            df = se2**2 / (v**2 / (n - 1)).sum(axis=0)
+            return t**2, 2 * stats.t.sf(np.abs(t), df)
+        # ≥3 → one-way ANOVA
+        k, n_total = len(n), n.sum()
+        grand_mean = sums.sum(axis=0) / n_total
+        ss_between = (n * (means - grand_mean) ** 2).sum(axis=0)
+        ss_within = ss_within_g.sum(axis=0)
+        f_stat = (ss_between / (k - 1)) / (ss_within / (n_total - k))
+        return f_stat, stats.f.sf(f_stat, k - 1, n_total - k)
+
+
+def task_a_discrete_vars(X: pd.DataFrame, y: pd.Series, plot_jobs: list = None):
+    """Identify top-3 categorical features driving price."""
+    # Combine rare categories
+    for col in CAT_COLS:
+        X[col] = collapse_rare(X[col], 50)
+
+    # Sufficient statistics for raw and log price at once, centered on the overall means
+    targets = np.column_stack([y.to_numpy(dtype=float), np.log1p(y.to_numpy(dtype=float))])
+    centered = targets - targets.mean(axis=0)
+    ss_total = (centered[:, 0] ** 2).sum()
+
+    scores = {}
+    log_scores = {}
+    eta_squared = {}
+    for col in CAT_COLS:
+        n, sums, sumsq = grouped_sums(X[col], centered)
+        keep = n >= 5  # Minimum 5 samples
+        if keep.sum() < 2:
+            continue
+        f_stat, p = f_test_from_sums(n[keep], sums[keep], sumsq[keep])
+        scores[col] = (f_stat[0], p[0])
+        log_scores[col] = (f_stat[1], p[1])
+        # η² = Σ n_g (mean_g - mean)² / Σ (y - mean)²
+        eta_squared[col] = (sums[keep, 0] ** 2 / n[keep]).sum() / ss_total
+
+    top3 = sorted(scores.items(), key=lambda x: x[1][0], reverse=True)[:3]
+
+    # Plot specs (rendered later, possibly in worker processes)
+    if plot_jobs is not None:
+        for col, (f_stat, p_val) in top3:
+            data = pd.DataFrame({col: X[col], "Price": y})
+            cat_means = data.groupby(col, observed=True)["Price"].mean().sort_values(ascending=False)
+            order = cat_means.index.tolist()
+            counts = data[col].value_counts()
+            sample_data = data.sample(min(1000, len(data)))
+            plot_jobs.append(
+                PlotJob(
+                    "category_box",
+                    f"a_box_{col}.png",
+                    {
+                        "col": col,
+                        "x": data[col].to_numpy(dtype=object),
+                        "price": data["Price"].to_numpy(),
+                        "sample_x": sample_data[col].to_numpy(dtype=object),
+                        "sample_price": sample_data["Price"].to_numpy(),
+                        "order": order,
+                        "counts": [int(counts.get(category, 0)) for category in order],
+                        "title": (
+                            f"Price distribution by {col}\n"
+                            f"(F={f_stat:.1f}, p={p_val:.3f}, η²={eta_squared[col]:.3f})"
+                        ),
+                    },
+                    dpi=300,
+                    tight=True,
+                )
+            )
+
+    return top3, eta_squared, log_scores
+
+
+# =========================================================
+# Task b – correlation between rooms, price, duration
+# =========================================================
+def task_b_correlation(X: pd.DataFrame, y: pd.Series, plot_jobs: list = None):
+    """Compute correlations between rooms and price with improved visualization."""
+    subset = pd.DataFrame({"Rooms": X["Number_of_rooms"], "Price": y})
+    subset["LogPrice"] = np.log1p(subset["Price"])
+    N = len(subset)
+
+    # Calculate correlation matrices for both raw and log-transformed prices
+    corr_p = subset[["Rooms", "Price", "LogPrice"]].corr(method="pearson")
+    corr_s = subset[["Rooms", "Price", "LogPrice"]].corr(method="spearman")
+
+    if plot_jobs is not None:
+        # Scatter plot with log-transformed price
+        r_p = corr_p.loc["Rooms", "LogPrice"]
+        r_s = corr_s.loc["Rooms", "LogPrice"]
+        plot_jobs.append(
+            PlotJob(
+                "rooms_regplot",
+                "b_scatter_pair.png",
+                {
+                    "rooms": subset["Rooms"].to_numpy(),
+                    "log_price": subset["LogPrice"].to_numpy(),
+                    "text": f"Pearson (ρ) = {r_p:.2f}\nSpearman (ρₛ) = {r_s:.2f}",
+                    "title": f"Log-Price vs Rooms correlation (N={N})",
+                },
+                dpi=300,
+                tight=True,
+            )
+        )
+
+        # Box plot for price distribution by room count
+        room_counts = subset["Rooms"].value_counts()
+        valid_rooms = room_counts[room_counts >= 10].index.sort_values()
+        box_data = subset[subset["Rooms"].isin(valid_rooms)]
+        plot_jobs.append(
+            PlotJob(
+                "rooms_box",
+                "b_box_rooms.png",
+                {"rooms": box_data["Rooms"].to_numpy(), "price": box_data["Price"].to_numpy()},
+                dpi=300,
+                tight=True,
+            )
+        )
+
+        # Correlation heatmap
+        plot_jobs.append(
+            PlotJob(
+                "heatmap",
+                "b_corr_dual.png",
+                {
+                    "matrix": corr_p[["Price", "LogPrice"]].loc[["Rooms", "Price", "LogPrice"]],
+                    "title": f"Correlation matrix (N={N})",
+                },
+                dpi=300,
+                tight=True,
+            )
+        )
+
+    return corr_p, corr_s
+
+
+# =========================================================
+# Task c – address significance + three further attributes
+# =========================================================
+def _fit_transform_prep(preproc, X: pd.DataFrame, y: pd.Series):
+    """Fit the preprocessor and return it with the transformed matrix (cacheable with ``joblib.Memory``)."""
+    Xt = preproc.fit_transform(X, y)
+    return preproc, Xt
+
+
+def _warm_start_cv(folds: list, n_estimators: int, max_estimators: int, n_jobs: int):
+    """Grow one warm-started forest per fold until the mean CV RMSE stabilises.
+
+    ``folds`` holds ``(Xt_train, y_train, Xt_test, y_test)`` tuples of already-preprocessed data.
+    Returns the chosen tree count and the ``(n_estimators, rmse)`` path.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_squared_error
+
+    forests = [
+        RandomForestRegressor(warm_start=True, random_state=RANDOM_SEED, n_jobs=n_jobs) for _ in range(len(folds))
+    ]
+    path = []
+    n = n_estimators
+    while True:
+        fold_rmse = []
+        for forest, (Xt_train, y_train, Xt_test, y_test) in zip(forests, folds):
+            forest.set_params(n_estimators=n).fit(Xt_train, y_train)
+            fold_rmse.append(np.sqrt(mean_squared_error(y_test, forest.predict(Xt_test))))
+        path.append((n, float(np.mean(fold_rmse))))
+        if len(path) >= 2 and abs(path[-2][1] - path[-1][1]) <= WARM_START_TOL * path[-2][1]:
+            break
+        if n >= max_estimators:
+            break
+        n = min(n + WARM_START_STEP, max_estimators)
+    return n, path
+
+
+def task_c_address_and_features(
+    X: pd.DataFrame,
+    plot_jobs: list = None,
+    cache_dir=None,
+    n_estimators: int = 20,
+    max_threads: int = None,
+    warm_start: bool = False,
+    max_estimators: int = 200,
+    cat_encoding: str = "onehot",
+    max_categories: int = 50,
+    hash_features: int = 64,
+):
+    """Analyze address significance and identify key price predictors.
+
+    With ``cache_dir`` set, fitted preprocessing (imputation, scaling, one-hot) is cached on disk,
+    keyed by transformer parameters and input data, for every CV fold and for the final fit. Folds and
+    the final fit transform different rows, so the cache pays off on later runs, not within one run.
+    The thread budget (all available cores, capped by ``max_threads``) is split between CV folds and
+    forest trees by ``plan_parallelism``. With ``warm_start`` the forest grows from ``n_estimators``
+    in steps of ``WARM_START_STEP`` until CV RMSE stabilises (at most ``max_estimators`` trees).
+    Categorical encodings are sparse (CSR) and reach the forest sparse whenever the stacked matrix is
+    mostly zeros. Columns with more than
+    ``max_categories`` distinct values use ``cat_encoding`` (``onehot``, frequency-``capped`` or
+    ``hashed`` into ``hash_features`` buckets); importances are also summed per input column.
+    Returns ``(rmse, top3_features, timings, forest)``: ``timings`` maps stage name to seconds and
+    ``forest`` describes the parallelism plan, tree count and per-column importances.
+    """
+    from joblib import Memory
+    from sklearn.base import clone
+    from sklearn.model_selection import KFold, cross_validate
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.impute import SimpleImputer
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.ensemble import RandomForestRegressor
+
+    from .encoding import aggregate_importances, categorical_pipe
+
+    timings = {}
+    memory = Memory(cache_dir, verbose=0)  # location=None disables caching
+
+    y = X["Price_usd_month"]
+    X = X.drop(columns=["Price_usd_month"])
+    model_cols = X.columns.tolist()
+
+    # Preprocessing
+    numeric_pipe = Pipeline([("imp", SimpleImputer(strategy="median")), ("sc", StandardScaler())])
+    num_cols = [c for c in model_cols if c in NUM_COLS]
+    cat_cols = [c for c in model_cols if c not in num_cols]
+    wide_cols = [c for c in cat_cols if cat_encoding != "onehot" and X[c].nunique() > max_categories]
+    transformers = [
+        ("num", numeric_pipe, num_cols),
+        ("cat", categorical_pipe("onehot"), [c for c in cat_cols if c not in wide_cols]),
+    ]
+    if wide_cols:
+        transformers.append(("wide", categorical_pipe(cat_encoding, max_categories, hash_features), wide_cols))
+    # Encoders emit CSR; the stacked matrix stays CSR once it is mostly zeros (density < SPARSE_THRESHOLD),
+    # i.e. as category counts grow. Forcing CSR on a mostly-dense matrix slows the forest several-fold.
+    preproc = ColumnTransformer(transformers, sparse_threshold=SPARSE_THRESHOLD)
+
+    cv = KFold(n_splits=CV_FOLDS, shuffle=True, random_state=RANDOM_SEED)
+    plan = plan_parallelism(len(X), max_estimators if warm_start else n_estimators, CV_FOLDS, max_threads=max_threads)
+    if warm_start:
+        # Folds run one after another, each forest using the whole thread budget
+        plan = ParallelPlan(1, plan.budget, plan.budget, "warm start: folds sequential")
+    forest = {"plan": plan, "n_estimators": n_estimators, "warm_start_path": None}
+
+    if warm_start:
+        with stage_timer(timings, "cv total (wall)"):
+            folds = []
+            for train_idx, test_idx in cv.split(X):
+                X_tr, X_te = X.iloc[train_idx], X.iloc[test_idx]
+                fold_prep, Xt_tr = memory.cache(_fit_transform_prep)(clone(preproc), X_tr, y.iloc[train_idx])
+                folds.append((Xt_tr, y.iloc[train_idx], fold_prep.transform(X_te), y.iloc[test_idx]))
+            n_estimators, path = _warm_start_cv(folds, n_estimators, max_estimators, plan.tree_jobs)
+        rmse = path[-1][1]
+        forest.update(n_estimators=n_estimators, warm_start_path=path)
+        final_jobs = plan.tree_jobs
+    else:
+        rf = RandomForestRegressor(n_estimators=n_estimators, random_state=RANDOM_SEED, n_jobs=plan.tree_jobs)
+        model = Pipeline([("prep", preproc), ("rf", rf)], memory=memory)
+        with stage_timer(timings, "cv total (wall)"):
+            cv_results = cross_validate(model, X, y, cv=cv, scoring="neg_root_mean_squared_error", n_jobs=plan.cv_jobs)
+        rmse = -cv_results["test_score"].mean()
+        timings["cv fit (sum over folds)"] = cv_results["fit_time"].sum()
+        timings["cv score (sum over folds)"] = cv_results["score_time"].sum()
+        final_jobs = min(plan.budget, n_estimators)
+
+    # Final fit, one stage at a time so the forest cost is visible on its own; its preprocessing is
+    # keyed on the full data, so it hits the cache of an earlier run only (never a fold's entry)
+    with stage_timer(timings, "final preprocessing"):
+        preproc, Xt = memory.cache(_fit_transform_prep)(preproc, X, y)
+    with stage_timer(timings, "final forest fit"):
+        rf = RandomForestRegressor(n_estimators=n_estimators, random_state=RANDOM_SEED, n_jobs=final_jobs).fit(Xt, y)
+
+    # Feature importance
+    feature_names = preproc.get_feature_names_out()
+    importances = pd.Series(rf.feature_importances_, index=feature_names)
+    top3_features = importances.sort_values(ascending=False).head(3)
+    forest["column_importances"] = aggregate_importances(importances, model_cols)
+
+    if plot_jobs is not None:
+        # Plot feature importance
+        top10 = importances.sort_values(ascending=True).tail(10)
+        plot_jobs.append(
+            PlotJob("importance", "c_feature_importance.png", {"values": top10.to_numpy(), "labels": top10.index})
+        )
+
+        # Scatter plots for numeric features
+        for col in num_cols:
+            if col in X.columns:  # Only plot if feature wasn't one-hot encoded
+                plot_jobs.append(
+                    PlotJob(
+                        "feature_regplot",
+                        f"c_scatter_{col}.png",
+                        {"x_name": col, "x": X[col].to_numpy(), "y_name": y.name, "y": y.to_numpy()},
+                    )
+                )
+
+    return rmse, top3_features, timings, forest
@@ -0,0 +1,70 @@
+"""Benchmark ``find_duplicate_subjects`` against the row-wise ``df.apply`` version.
+
+Run from this directory: ``python bench_duplicate_subjects.py [n_rows]``
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from clean_gcse_data import SUBJECT_COLS, find_duplicate_subjects
+
+SUBJECTS = [
+    "Maths",
+    "English Language",
+    "English Literature",
+    "Double Science",
+    "History",
+    "Geography",
+    "Geology",
+    "NA",
+]
+
+
+def flag_duplicates(row):
+    """Row-wise reference implementation (as in the original GCSE cleaning script)."""
+    subjects = [row[f"subject{i}"] for i in range(1, 6)]
+    subjects = [s for s in subjects if s != "NA"]
+    if len(subjects) != len(set(subjects)):
+        return True
+    return False
+
+
+def make_block(n_rows, seed=0):
+    """Five subject columns drawn at random, so most students repeat one."""
+    rng = np.random.default_rng(seed)
+    choice = rng.integers(0, len(SUBJECTS), (n_rows, len(SUBJECT_COLS)))
+    picks = np.array(SUBJECTS, dtype=object)[choice]
+    return pd.DataFrame(picks, columns=SUBJECT_COLS)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    block = make_block(n_rows)
+    categorical = block.astype(pd.CategoricalDtype(SUBJECTS))
+
+    start = time.perf_counter()
+    expected = block.apply(flag_duplicates, axis=1)
+    t_apply = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flags, duplicated = find_duplicate_subjects(block)
+    t_strings = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flags_cat, _ = find_duplicate_subjects(categorical)
+    t_codes = time.perf_counter() - start
+
+    pd.testing.assert_series_equal(flags, expected, check_dtype=False)
+    pd.testing.assert_series_equal(flags_cat, expected, check_dtype=False)
+    print(f"{n_rows:,} students, {expected.mean():.0%} with a repeated subject")
+    print(f"df.apply(axis=1):         {t_apply:8.3f}s")
+    print(f"vectorized (strings):     {t_strings:8.3f}s  ({t_apply / t_strings:6.1f}x)")
+    print(f"vectorized (categorical): {t_codes:8.3f}s  ({t_apply / t_codes:6.1f}x)")
+    print(f"e.g. {duplicated[flags].iloc[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Clean many GCSE ARFF exports (one per exam board per year) in a process pool.
+
+Each input is streamed through ``clean_gcse_frame`` into its own output shard, and
+``manifest.json`` in the output directory records per-file row, invalid-date and
+duplicate-subject counts together with the input's content hash. On a re-run, files
+whose hash (and the cleaning code) still match the manifest are skipped.
+
+Example, from the repository root:
+    python Week2-Ready-for-Analysis/Cleaning-Data/GCSE-Results-Data/clean_gcse_batch.py \
+        "exports/**/*.arff" exports/2024 --out-dir gcse_clean --workers 4
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# repository root, for the helpers shared with the other course scripts (datatools/)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from datatools import arff, dates  # noqa: E402
+
+from clean_gcse_data import GRADE_COLS, clean_gcse_frame  # noqa: E402
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_digest():
+    """Hash of the cleaning code, so editing it re-cleans every file."""
+    sources = [
+        Path(__file__).with_name("clean_gcse_data.py"),
+        arff.__file__,
+        dates.__file__,
+    ]
+    return hashlib.blake2b(
+        "\n".join(file_digest(p) for p in sources).encode(), digest_size=16
+    ).hexdigest()
+
+
+def expand_inputs(patterns):
+    """Resolve files, directories (every ``*.arff`` below them) and globs."""
+    found = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found.extend(sorted(path.rglob("*.arff")))
+        elif path.is_file():
+            found.append(path)
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"no input matches {pattern!r}")
+            found.extend(Path(m) for m in matches)
+    return list(dict.fromkeys(p.resolve() for p in found))
+
+
+def shard_name(source, fmt):
+    """Output name for one input; the path hash keeps same-named files apart."""
+    tag = hashlib.blake2b(str(source).encode(), digest_size=4).hexdigest()
+    return f"{source.stem}-{tag}.{fmt}"
+
+
+def load_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.is_file():
+        return {"version": MANIFEST_VERSION, "files": {}}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "files": {}}
+    return manifest
+
+
+def save_manifest(out_dir, manifest):
+    # write next to the target and swap in, so an interrupted run keeps the old manifest
+    fd, tmp = tempfile.mkstemp(dir=out_dir, suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, Path(out_dir) / MANIFEST_NAME)
+
+
+def clean_file(source, out_path, fmt="csv", chunksize=arff.ARFF_CHUNKSIZE):
+    """Stream one ARFF file into ``out_path``; returns its summary counts."""
+    counts = {
+        "rows": 0,
+        "unknown_names": 0,
+        "invalid_dates": 0,
+        "invalid_grades": 0,
+        "duplicate_subjects": 0,
+    }
+
+    def transform(chunk):
+        chunk = clean_gcse_frame(chunk)
+        counts["rows"] += len(chunk)
+        counts["unknown_names"] += int(chunk["firstname"].eq("UNKNOWN").sum())
+        counts["invalid_dates"] += int(chunk["dob"].eq("Invalid Date").sum())
+        invalid_grades = chunk[GRADE_COLS].eq("Invalid").any(axis=1)
+        counts["invalid_grades"] += int(invalid_grades.sum())
+        counts["duplicate_subjects"] += int(chunk["has_duplicate_subjects"].sum())
+        if fmt == "parquet":
+            # plain strings keep one Parquet schema across chunks
+            chunk = chunk.astype({c: str for c in chunk.select_dtypes("category")})
+        return chunk
+
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    write = arff.arff_to_parquet if fmt == "parquet" else arff.arff_to_csv
+    try:
+        write(source, tmp, chunksize=chunksize, transform=transform)
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return counts
+
+
+def _clean_job(job):
+    source, out_path, fmt, chunksize, digest = job
+    counts = clean_file(source, out_path, fmt, chunksize)
+    return {"sha": digest, "output": out_path.name, **counts}
+
+
+def run_batch(
+    inputs,
+    out_dir,
+    fmt="csv",
+    workers=None,
+    chunksize=arff.ARFF_CHUNKSIZE,
+    force=False,
+):
+    """Clean every input that changed since the last run; returns the new manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    code = code_digest()
+    if manifest.get("code") != code:
+        force = True
+    manifest["code"] = code
+
+    jobs, skipped = [], []
+    for source in inputs:
+        digest = file_digest(source)
+        entry = manifest["files"].get(str(source))
+        out_path = out_dir / shard_name(source, fmt)
+        if (
+            not force
+            and entry is not None
+            and entry["sha"] == digest
+            and entry["output"] == out_path.name
+            and out_path.is_file()
+        ):
+            skipped.append(source)
+            continue
+        jobs.append((source, out_path, fmt, chunksize, digest))
+
+    if workers == 1 or len(jobs) <= 1:
+        results = [_clean_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_clean_job, jobs))
+
+    for job, entry in zip(jobs, results):
+        previous = manifest["files"].get(str(job[0]))
+        if previous is not None and previous["output"] != entry["output"]:
+            # e.g. the output format changed: drop the stale shard
+            (out_dir / previous["output"]).unlink(missing_ok=True)
+        manifest["files"][str(job[0])] = entry
+    save_manifest(out_dir, manifest)
+
+    print(f"Cleaned {len(jobs)} file(s), skipped {len(skipped)} unchanged")
+    for job, entry in zip(jobs, results):
+        print(
+            f"  {job[0].name}: {entry['rows']} rows, "
+            f"{entry['invalid_dates']} invalid dates, "
+            f"{entry['duplicate_subjects']} with duplicate subjects"
+            f" -> {entry['output']}"
+        )
+    return manifest
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "inputs", nargs="+", help="ARFF files, directories or glob patterns"
+    )
+    parser.add_argument("--out-dir", type=Path, default=Path("gcse_cleaned"))
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes (default: CPU count)"
+    )
+    parser.add_argument("--chunksize", type=int, default=arff.ARFF_CHUNKSIZE)
+    parser.add_argument(
+        "--force", action="store_true", help="re-clean files even if unchanged"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_batch(
+        expand_inputs(args.inputs),
+        args.out_dir,
+        fmt=args.format,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,83 +1,150 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-from datetime import datetime
 import numpy as np
 
-
-def clean_gcse_data(input_file):
-    # Read the ARFF file
-    # Skip the ARFF header (lines starting with @)
-    with open(input_file, "r") as f:
-        lines = f.readlines()
-        data_start = [i for i, line in enumerate(lines) if line.strip() == "@data"][
-            0
-        ] + 1
-        data_lines = [line.strip() for line in lines[data_start:]]
-
-    # Convert to DataFrame
-    df = pd.DataFrame([line.split(",") for line in data_lines])
-    df.columns = ["firstname", "lastname", "gender", "dob", "auth"] + sum(
-        [[f"subject{i}", f"grade{i}"] for i in range(1, 6)], []
+# repository root, for the helpers shared with the other course scripts (datatools/)
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from datatools.arff import ARFF_CHUNKSIZE, iter_arff  # noqa: E402
+from datatools.dates import normalise_dates  # noqa: E402
+
+DOB_FORMATS = ["%Y/%m/%d", "%d/%m/%Y", "%Y/%b/%d"]
+N_SUBJECTS = 5
+SUBJECT_COLS = [f"subject{i}" for i in range(1, N_SUBJECTS + 1)]
+GRADE_COLS = [f"grade{i}" for i in range(1, N_SUBJECTS + 1)]
+
+LETTER_GRADES = {"A*", "A+", "A", "B", "C", "D", "E", "F", "G", "U"}
+# Map numeric grades to letters (simplified mapping)
+NUMERIC_GRADES = {7: "A", 6: "B", 5: "C", 4: "D", 3: "E", 2: "F", 1: "G", 0: "U"}
+
+
+def standardize_grade(grade):
+    grade = str(grade).strip()
+    if grade in LETTER_GRADES:
+        return grade
+    if grade.isdigit() and 0 <= int(grade) <= 7:
+        return NUMERIC_GRADES[int(grade)]
+    if grade in ["", " "]:
+        return "NA"
+    return "Invalid"
+
+
+def clean_subject(subject):
+    if pd.isna(subject) or subject.strip() in ["", " "]:
+        return "NA"
+    # Remove quotes and standardize
+    return subject.strip().strip("'")
+
+
+def _lookup_block(block, clean):
+    """Apply ``clean`` to a block of columns once per distinct value.
+
+    Each column is factorized and the per-column uniques are merged into one
+    vocabulary for the whole (melted) block; ``clean`` is evaluated on that
+    vocabulary only (plus once for missing, code -1), and the lookup table is
+    applied to the codes to rebuild categorical columns sharing one dtype.
+    """
+    factorized = [pd.factorize(block[col]) for col in block.columns]
+    vocab = pd.Index(
+        np.concatenate([np.asarray(u, dtype=object) for _, u in factorized])
+    ).unique()
+    table = [clean(u) for u in vocab] + [clean(np.nan)]
+    categories, table_codes = np.unique(
+        np.array(table, dtype=object), return_inverse=True
     )
+    dtype = pd.CategoricalDtype(categories)
+
+    cleaned = {}
+    for col, (codes, uniques) in zip(block.columns, factorized):
+        # column codes -> vocabulary codes (missing stays -1, i.e. the last entry)
+        to_vocab = np.append(vocab.get_indexer(np.asarray(uniques, dtype=object)), -1)
+        cleaned[col] = pd.Categorical.from_codes(
+            table_codes[to_vocab[codes]], dtype=dtype
+        )
+    return pd.DataFrame(cleaned, index=block.index)
+
+
+def normalise_subjects_and_grades(df):
+    """Clean every subjectN/gradeN column with a single lookup per block."""
+    df = df.copy()
+    df[GRADE_COLS] = _lookup_block(df[GRADE_COLS], standardize_grade)
+    df[SUBJECT_COLS] = _lookup_block(df[SUBJECT_COLS], clean_subject)
+    return df
 
-    # Clean names
-    df["firstname"] = df["firstname"].replace("", "UNKNOWN")
-    df["lastname"] = df["lastname"].replace("", "UNKNOWN")
 
-    # Clean gender
+def _subject_codes(block, missing):
+    """Integer codes (n_rows, n_cols) for a block of subject columns, -1 for missing."""
+    dtypes = block.dtypes
+    shared = (dtypes == dtypes.iloc[0]).all()
+    if isinstance(dtypes.iloc[0], pd.CategoricalDtype) and shared:
+        # shared categorical dtype (from normalise_subjects_and_grades): reuse codes
+        vocab = dtypes.iloc[0].categories
+        codes = np.column_stack([block[col].cat.codes.to_numpy() for col in block])
+    else:
+        codes, vocab = pd.factorize(block.to_numpy(dtype=object).ravel())
+        codes, vocab = codes.reshape(block.shape), pd.Index(vocab)
+    codes = codes.astype(np.int64)
+    if missing in vocab:
+        codes[codes == vocab.get_loc(missing)] = -1
+    return codes, np.asarray(vocab, dtype=object)
+
+
+def find_duplicate_subjects(block, missing="NA", sep="; "):
+    """Flag rows that list the same subject more than once, ignoring ``missing``.
+
+    Each row's subject codes are sorted, so repeats become adjacent and a single
+    equality check against the left neighbour finds them. Returns a boolean Series
+    and a string Series naming the repeated subjects ("" when there are none).
+    """
+    codes, vocab = _subject_codes(block, missing)
+    ordered = np.sort(codes, axis=1)
+    repeat = (ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] >= 0)
+    flags = pd.Series(repeat.any(axis=1), index=block.index)
+
+    # report each repeated subject once, even if it appears three or more times
+    first = repeat.copy()
+    first[:, 1:] &= ~repeat[:, :-1]
+    rank = first.cumsum(axis=1)
+    names = vocab[ordered[:, 1:].clip(min=0)]
+    duplicated = np.full(len(block), "", dtype=object)
+    for k in range(1, rank.max(initial=0) + 1):
+        # the k-th repeated subject of each row (in sorted order), if it has one
+        hit = first & (rank == k)
+        has = hit.any(axis=1)
+        kth = names[has, hit[has].argmax(axis=1)]
+        duplicated[has] = kth if k == 1 else duplicated[has] + sep + kth
+    return flags, pd.Series(duplicated, index=block.index)
+
+
+def clean_gcse_data(input_file, chunksize=ARFF_CHUNKSIZE):
+    # Stream the ARFF data section in typed chunks (quoted values such as
+    # 'English Literature' are tokenised as one field) and clean each chunk
+    chunks = [clean_gcse_frame(chunk) for chunk in iter_arff(input_file, chunksize)]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def clean_gcse_frame(df):
+    df = df.copy()
+
+    # Clean names (empty or missing, "?" in the ARFF)
+    df["firstname"] = df["firstname"].fillna("").replace("", "UNKNOWN")
+    df["lastname"] = df["lastname"].fillna("").replace("", "UNKNOWN")
+
+    # Clean gender; missing and unexpected values are flagged as U
     gender_map = {"m": "M", "f": "F", "x": "O", "mf": "U", "": "U"}  # Flag for review
-    df["gender"] = df["gender"].map(lambda x: gender_map.get(x.strip(), "U"))
-
-    # Clean dates
-    def standardize_date(date_str):
-        date_str = date_str.strip()
-        try:
-            # Try different date formats
-            for fmt in ["%Y/%m/%d", "%d/%m/%Y", "%Y/%b/%d"]:
-                try:
-                    return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
-            return "Invalid Date"
-        except:
-            return "Invalid Date"
-
-    df["dob"] = df["dob"].map(standardize_date)
-
-    # Clean grades
-    def standardize_grade(grade):
-        grade = str(grade).strip()
-        if grade in ["A*", "A+", "A", "B", "C", "D", "E", "F", "G", "U"]:
-            return grade
-        if grade.isdigit() and 0 <= int(grade) <= 7:
-            # Map numeric grades to letters (simplified mapping)
-            grade_map = {7: "A", 6: "B", 5: "C", 4: "D", 3: "E", 2: "F", 1: "G", 0: "U"}
-            return grade_map[int(grade)]
-        if grade in ["", " "]:
-            return "NA"
-        return "Invalid"
-
-    for i in range(1, 6):
-        df[f"grade{i}"] = df[f"grade{i}"].map(standardize_grade)
-
-    # Clean subjects
-    def clean_subject(subject):
-        if pd.isna(subject) or subject.strip() in ["", " "]:
-            return "NA"
-        # Remove quotes and standardize
-        return subject.strip().strip("'")
-
-    for i in range(1, 6):
-        df[f"subject{i}"] = df[f"subject{i}"].map(clean_subject)
-
-    # Flag duplicate subjects per student
-    def flag_duplicates(row):
-        subjects = [row[f"subject{i}"] for i in range(1, 6)]
-        subjects = [s for s in subjects if s != "NA"]
-        if len(subjects) != len(set(subjects)):
-            return True
-        return False
-
-    df["has_duplicate_subjects"] = df.apply(flag_duplicates, axis=1)
+    df["gender"] = df["gender"].str.strip().map(gender_map).fillna("U")
+
+    # Clean dates (each distinct string parsed once, vectorized per format)
+    df["dob"] = normalise_dates(df["dob"], candidates=DOB_FORMATS)
+
+    # Clean grades and subjects (one lookup over the distinct values of all five pairs)
+    df = normalise_subjects_and_grades(df)
+
+    # Flag duplicate subjects per student, and name the subjects repeated
+    flags, duplicated = find_duplicate_subjects(df[SUBJECT_COLS])
+    df["has_duplicate_subjects"] = flags
+    df["duplicate_subjects"] = duplicated
 
     return df
 
@@ -0,0 +1 @@
+"""Small helpers shared by the course scripts (``@sample2`` and the weekly activities)."""
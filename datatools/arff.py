@@ -0,0 +1,270 @@
+"""Streaming reader for ARFF files (Weka's attribute-relation format).
+
+The ``@attribute`` header is parsed into pandas dtypes and each ``@data`` row is split on commas
+outside quotes (``'`` or ``"``, backslash escapes), so quoted values containing commas stay whole.
+Rows are read ``chunksize`` at a time and yielded as typed DataFrames; a present value that does not
+fit its declared type is an error, only ``?`` means missing. ``arff_to_csv`` and ``arff_to_parquet``
+stream the chunks straight to disk, so memory is bounded by the chunk size.
+"""
+
+import csv
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import pandas as pd
+
+ARFF_CHUNKSIZE = 100_000
+MISSING = "?"
+
+_ATTRIBUTE = re.compile(r"""@attribute\s+('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|\S+)\s+(.*)$""", re.IGNORECASE)
+# one data value: single- or double-quoted, or bare (up to the next comma), then its separator
+_VALUE = re.compile(r"""\s*(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|([^,'"][^,]*?)?)\s*(,|$)""")
+# Java SimpleDateFormat tokens used by ARFF DATE attributes -> strptime
+_JAVA_DATE_TOKENS = [("yyyy", "%Y"), ("MM", "%m"), ("dd", "%d"), ("HH", "%H"), ("mm", "%M"), ("ss", "%S")]
+
+
+class ArffAttribute(NamedTuple):
+    name: str
+    kind: str  # "numeric", "integer", "string", "nominal" or "date"
+    categories: tuple = ()
+    date_format: str = None
+
+
+def _unquote(token: str) -> str:
+    token = token.strip()
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "'\"":
+        return re.sub(r"\\(.)", r"\1", token[1:-1])
+    return token
+
+
+def _strip_comment(text: str) -> str:
+    """Drop a trailing ``% comment``, ignoring ``%`` inside quotes."""
+    quote = None
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "%":
+            return text[:i].rstrip()
+    return text.strip()
+
+
+def _java_to_strptime(fmt: str) -> str:
+    fmt = fmt.replace("'T'", "T")
+    for java, py in _JAVA_DATE_TOKENS:
+        fmt = fmt.replace(java, py)
+    return fmt
+
+
+def _parse_attribute(line: str) -> ArffAttribute:
+    match = _ATTRIBUTE.match(_strip_comment(line))
+    if match is None:
+        raise ValueError(f"malformed @attribute line: {line.strip()!r}")
+    name, spec = _unquote(match.group(1)), match.group(2).strip()
+    if spec.startswith("{"):
+        body = spec[1 : spec.rindex("}")]
+        categories = tuple(_unquote(v) for v in next(csv.reader([body], quotechar="'", skipinitialspace=True)))
+        return ArffAttribute(name, "nominal", categories)
+    kind, _, rest = spec.partition(" ")
+    kind = kind.lower()
+    if kind in ("numeric", "real"):
+        return ArffAttribute(name, "numeric")
+    if kind == "integer":
+        return ArffAttribute(name, "integer")
+    if kind == "string":
+        return ArffAttribute(name, "string")
+    if kind == "date":
+        # ARFF's default date format is ISO-8601
+        return ArffAttribute(name, "date", date_format=_java_to_strptime(_unquote(rest)) if rest.strip() else None)
+    raise ValueError(f"unsupported attribute type {spec!r} for {name!r}")
+
+
+def read_header(f) -> tuple:
+    """Consume the header of an open ARFF file up to and including ``@data``.
+
+    Returns ``(relation, attributes)``; ``f`` is left positioned at the first data line.
+    """
+    relation, attributes = None, []
+    for line in f:
+        text = line.strip()
+        if not text or text.startswith("%"):
+            continue
+        keyword = text.split(None, 1)[0].lower()
+        if keyword == "@relation":
+            relation = _unquote(_strip_comment(text)[len("@relation") :])
+        elif keyword == "@attribute":
+            attributes.append(_parse_attribute(text))
+        elif keyword == "@data":
+            return relation, attributes
+        else:
+            raise ValueError(f"unexpected line in ARFF header: {text!r}")
+    raise ValueError("ARFF file has no @data section")
+
+
+def arff_dtypes(attributes) -> dict:
+    """pandas dtype for each attribute; DATE attributes map to ``datetime64[ns]``."""
+    dtypes = {}
+    for attr in attributes:
+        if attr.kind == "numeric":
+            dtypes[attr.name] = "float64"
+        elif attr.kind == "integer":
+            dtypes[attr.name] = "Int64"
+        elif attr.kind == "nominal":
+            dtypes[attr.name] = pd.CategoricalDtype(list(attr.categories))
+        elif attr.kind == "date":
+            dtypes[attr.name] = "datetime64[ns]"
+        else:
+            dtypes[attr.name] = object
+    return dtypes
+
+
+def _data_lines(f):
+    for line in f:
+        text = line.strip()
+        if not text or text.startswith("%"):
+            continue
+        if text.startswith("{"):
+            raise ValueError("sparse ARFF data is not supported")
+        yield text
+
+
+def _split_row(text: str) -> list:
+    """Split one data row into values, unquoting ``'...'`` and ``"..."`` as the header parser does.
+
+    >>> _split_row("'a, b', 1, ?")
+    ['a, b', '1', '?']
+    >>> _split_row('"a, b",1,"it\\'s"')
+    ['a, b', '1', "it's"]
+    >>> _split_row("'don\\\\'t', x")
+    ["don't", 'x']
+    >>> _split_row("O'Brien, ,x")
+    ["O'Brien", '', 'x']
+    """
+    if "'" not in text and '"' not in text:
+        return [value.strip() for value in text.split(",")]
+    values, pos = [], 0
+    while True:
+        match = _VALUE.match(text, pos)
+        if match is None:
+            raise ValueError(f"malformed ARFF data row: {text!r}")
+        single, double, bare, sep = match.groups()
+        if single is not None or double is not None:
+            values.append(re.sub(r"\\(.)", r"\1", single if single is not None else double))
+        else:
+            values.append(bare or "")
+        if not sep:
+            return values
+        pos = match.end()
+
+
+def _typed_chunk(rows: list, attributes, dtypes: dict, first_row: int = 0) -> pd.DataFrame:
+    """Typed DataFrame of raw ``rows``; raises ValueError for present values that fail to convert.
+
+    >>> attrs = [ArffAttribute("x", "numeric"), ArffAttribute("c", "nominal", ("A", "B"))]
+    >>> _typed_chunk([["1.5", "A"], ["?", "?"]], attrs, arff_dtypes(attrs)).isna().sum().tolist()
+    [1, 1]
+    >>> _typed_chunk([["x2", "Z"]], attrs, arff_dtypes(attrs))
+    Traceback (most recent call last):
+    ...
+    ValueError: attribute 'x' (numeric): 1 value(s) do not match the declared type, e.g. 'x2' in data row 1
+    """
+    names = [a.name for a in attributes]
+    df = pd.DataFrame(rows, columns=names, dtype=object)
+    for attr in attributes:
+        col = df[attr.name]
+        missing = col.eq(MISSING)
+        present = col.mask(missing)
+        if attr.kind in ("numeric", "integer"):
+            typed = pd.to_numeric(present, errors="coerce")
+        elif attr.kind == "date":
+            typed = pd.to_datetime(present, format=attr.date_format or "ISO8601", errors="coerce")
+        elif attr.kind == "nominal":
+            typed = present.astype(dtypes[attr.name])
+        else:
+            if missing.any():
+                df[attr.name] = present
+            continue
+        # only "?" is missing: anything else that did not convert breaks the declared schema
+        bad = typed.isna().to_numpy() & ~missing.to_numpy()
+        if bad.any():
+            row = bad.argmax()
+            raise ValueError(
+                f"attribute {attr.name!r} ({attr.kind}): {bad.sum()} value(s) do not match the declared type, "
+                f"e.g. {col.iloc[row]!r} in data row {first_row + row + 1}"
+            )
+        df[attr.name] = typed.astype(dtypes[attr.name])
+    return df
+
+
+def iter_arff(path, chunksize: int = ARFF_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield the data section of the ARFF file at ``path`` as typed DataFrames of ``chunksize`` rows.
+
+    Values may be quoted with ``'`` or ``"`` (backslash escapes quotes inside); whitespace around
+    values is skipped and ``?`` becomes a missing value. STRING attributes stay as strings, so empty
+    fields come through as ``""``. Any other value that does not fit its attribute's type (a number,
+    date or declared nominal value) raises ValueError naming the attribute and data row.
+    """
+    with open(path, "r", newline="") as f:
+        _, attributes = read_header(f)
+        dtypes = arff_dtypes(attributes)
+        rows_read = 0
+        lines = _data_lines(f)
+        while True:
+            rows = [_split_row(text) for text in islice(lines, chunksize)]
+            if not rows:
+                return
+            bad = next((r for r in rows if len(r) != len(attributes)), None)
+            if bad is not None:
+                raise ValueError(f"expected {len(attributes)} values per row, got {len(bad)}: {bad!r}")
+            yield _typed_chunk(rows, attributes, dtypes, rows_read)
+            rows_read += len(rows)
+
+
+def read_arff(path) -> pd.DataFrame:
+    """Read a whole ARFF file into one typed DataFrame."""
+    chunks = list(iter_arff(path))
+    if not chunks:
+        with open(path, "r", newline="") as f:
+            _, attributes = read_header(f)
+        return pd.DataFrame({a.name: pd.Series(dtype=t) for a, t in zip(attributes, arff_dtypes(attributes).values())})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def arff_to_csv(path, out_path, chunksize: int = ARFF_CHUNKSIZE, transform=None) -> int:
+    """Stream the ARFF file at ``path`` to CSV, applying ``transform`` to each chunk; returns rows written."""
+    n_rows = 0
+    with open(out_path, "w", newline="") as out:
+        for i, chunk in enumerate(iter_arff(path, chunksize)):
+            if transform is not None:
+                chunk = transform(chunk)
+            chunk.to_csv(out, index=False, header=i == 0)
+            n_rows += len(chunk)
+    return n_rows
+
+
+def arff_to_parquet(path, out_path, chunksize: int = ARFF_CHUNKSIZE, transform=None) -> int:
+    """Stream the ARFF file at ``path`` to Parquet, one row group per chunk; returns rows written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in iter_arff(path, chunksize):
+            if transform is not None:
+                chunk = transform(chunk)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(Path(out_path), table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
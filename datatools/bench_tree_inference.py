@@ -0,0 +1,73 @@
+"""Benchmark ``CompiledTrees`` against the models' own ``predict_proba``: single-row and batch latency.
+
+The forest is where compiling pays: sklearn dispatches every forest call through joblib, which costs
+milliseconds even for one row. From a few thousand rows on, sklearn's Cython loop is the faster one.
+
+Run from the repository root: ``python -m datatools.bench_tree_inference [n_rows]``.
+"""
+
+import sys
+import time
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from datatools.tree_inference import compile_trees
+
+N_TRAIN = 20_000
+N_SINGLE = 200
+BATCH_SIZES = (16, 256, 4096)
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def single_row_latency(predict, X) -> float:
+    """Median seconds of one call with one row, over ``N_SINGLE`` rows."""
+    times = []
+    for i in range(N_SINGLE):
+        row = X[i : i + 1]
+        start = time.perf_counter()
+        predict(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # five numeric features, like the hotel cancellation models
+    X, y = make_classification(N_TRAIN + n_rows, 5, n_informative=4, n_redundant=1, random_state=0)
+    X_train, y_train, X_test = X[:N_TRAIN], y[:N_TRAIN], X[N_TRAIN:]
+    models = {
+        "DecisionTreeClassifier": DecisionTreeClassifier(random_state=0),
+        "RandomForestClassifier": RandomForestClassifier(random_state=0),
+    }
+    print(f"{N_TRAIN:,} training rows, {n_rows:,} scored rows")
+    for name, model in models.items():
+        model.fit(X_train, y_train)
+        compiled = compile_trees(model)
+        assert np.array_equal(compiled.predict_proba(X_test), model.predict_proba(X_test))
+        assert np.array_equal(compiled.predict(X_test), model.predict(X_test))
+
+        print(f"\n{name}: {compiled.n_trees} tree(s), {len(compiled.value):,} nodes, depth {compiled.max_depth}")
+        t_sk = single_row_latency(model.predict_proba, X_test)
+        t_cp = single_row_latency(compiled.predict_proba, X_test)
+        print(f"  {'1 row':>12}  sklearn {t_sk * 1e3:9.3f}ms  compiled {t_cp * 1e3:9.3f}ms  ({t_sk / t_cp:5.1f}x)")
+        for size in BATCH_SIZES + (n_rows,):
+            batch = X_test[:size]
+            t_sk = best_of(lambda: model.predict_proba(batch))
+            t_cp = best_of(lambda: compiled.predict_proba(batch))
+            label = f"{size:,} rows"
+            print(f"  {label:>12}  sklearn {t_sk * 1e3:9.3f}ms  compiled {t_cp * 1e3:9.3f}ms  ({t_sk / t_cp:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
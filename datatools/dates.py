@@ -0,0 +1,65 @@
+"""Vectorized normalisation of date columns that mix several string formats.
+
+Each distinct string is parsed once: one ``pd.to_datetime(format=...)`` pass per candidate format,
+each over the values still unparsed, and the results are broadcast back to every row. Formats seen
+in a sample of the column go first; the rest still get their pass over whatever is left.
+"""
+
+import pandas as pd
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%Y/%b/%d", "%d-%m-%Y", "%Y%m%d")
+
+
+def detect_formats(values: pd.Series, candidates=DATE_FORMATS, sample_size: int = 1000) -> list:
+    """Candidate formats that parse part of a sample of ``values``, most successful first."""
+    sample = values.dropna().astype(str).str.strip()
+    if len(sample) > sample_size:
+        sample = sample.sample(sample_size, random_state=0)
+    hits = {fmt: pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum() for fmt in candidates}
+    # stable sort keeps the candidates' priority order between equally successful formats
+    return [fmt for fmt in sorted(candidates, key=lambda f: -hits[f]) if hits[fmt] > 0]
+
+
+def _parse_uniques(values: pd.Series, formats, candidates):
+    """Factorize ``values`` and parse each distinct string; returns the codes and parsed uniques + NaT."""
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    if formats is None:
+        # the sample only orders the candidates: rare formats it missed still parse the leftovers
+        detected = detect_formats(text, candidates)
+        formats = detected + [fmt for fmt in candidates if fmt not in detected]
+
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[s]")
+    for fmt in formats:
+        todo = parsed.isna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(text[todo], format=fmt, errors="coerce")
+    # trailing NaT is what code -1 (missing value) picks up
+    return codes, pd.concat([parsed, pd.Series([pd.NaT], dtype=parsed.dtype)], ignore_index=True)
+
+
+def parse_dates(values: pd.Series, formats=None, candidates=DATE_FORMATS) -> pd.Series:
+    """Parse ``values`` into datetimes; unparseable or missing entries become ``NaT``.
+
+    ``formats`` are tried in order; by default they are detected from the column with
+    ``detect_formats(candidates=...)``. Only unique strings are parsed.
+    """
+    codes, parsed = _parse_uniques(values, formats, candidates)
+    return pd.Series(parsed.to_numpy()[codes], index=values.index, name=values.name)
+
+
+def normalise_dates(
+    values: pd.Series,
+    out_format: str = "%Y-%m-%d",
+    invalid: str = "Invalid Date",
+    formats=None,
+    candidates=DATE_FORMATS,
+) -> pd.Series:
+    """Rewrite date strings as ``out_format`` strings, with ``invalid`` for anything unparseable.
+
+    Parsing and formatting both run on the unique values only.
+    """
+    codes, parsed = _parse_uniques(values, formats, candidates)
+    text = parsed.dt.strftime(out_format).fillna(invalid)
+    return pd.Series(text.to_numpy(dtype=object)[codes], index=values.index, name=values.name)